@@ -6,15 +6,17 @@ float32 범위로 정규화하여 반환한다. 가능한 경우 `librosa`를 
 포맷을 지원하며, 설치되어 있지 않으면 WAV는 `scipy`로 읽고 mp3 계열은
 사용자에게 의존성 설치를 안내한다.
 
-리샘플링은 `target_sr`이 주어졌을 때 `scipy.signal.resample`로 처리한다.
+리샘플링은 `target_sr`이 주어졌을 때 `scipy.signal.resample_poly`(폴리페이즈)로 처리한다.
 한국어 주석으로 작성됨.
 """
 from __future__ import annotations
 
+from fractions import Fraction
 from typing import Tuple
 import os
 import subprocess
 import shutil
+import tempfile
 
 import numpy as np
 from scipy.io import wavfile
@@ -22,32 +24,60 @@ from scipy import signal
 
 
 def _to_float32(data: np.ndarray) -> np.ndarray:
-    """정수형 오디오를 -1..1 범위의 float32로 변환"""
+    """정수형 오디오를 -1..1 범위의 float32로 변환
+
+    정수 -> float32 변환과 스케일(역수 곱)을 출력 버퍼 하나에서 처리한다
+    (나눗셈 임시 배열/중복 astype 없음). 스케일은 2의 거듭제곱이라 결과는 나눗셈과 같다.
+    """
     if data.dtype == np.int16:
-        return (data.astype(np.float32) / 32768.0).astype(np.float32)
+        out = np.empty(data.shape, dtype=np.float32)
+        np.multiply(data, np.float32(1.0 / 32768.0), out=out, dtype=np.float32, casting="unsafe")
+        return out
     if data.dtype == np.int32:
-        return (data.astype(np.float32) / 2147483648.0).astype(np.float32)
+        out = np.empty(data.shape, dtype=np.float32)
+        np.multiply(data, np.float32(1.0 / 2147483648.0), out=out, dtype=np.float32, casting="unsafe")
+        return out
     if data.dtype == np.uint8:
-        return ((data.astype(np.float32) - 128.0) / 128.0).astype(np.float32)
-    return data.astype(np.float32)
+        out = data.astype(np.float32)
+        out -= 128.0
+        out *= 1.0 / 128.0
+        return out
+    return data.astype(np.float32, copy=False)
+
+
+def _downmix(data: np.ndarray) -> np.ndarray:
+    """(N, C) 다중 채널을 모노로 평균한다.
+
+    정수 PCM은 정수 누산기(int32/int64)에서 채널별 벡터 덧셈 후 나눗셈하고 원래
+    dtype으로 돌려준다 (float64 중간 배열 없이 _to_float32에서 한 번만 스케일).
+    """
+    if data.dtype.kind in "iu":
+        acc_dtype = np.int64 if data.dtype.itemsize >= 4 else np.int32
+        acc = data[:, 0].astype(acc_dtype)
+        for ch in range(1, data.shape[1]):
+            acc += data[:, ch]
+        acc //= data.shape[1]
+        return acc.astype(data.dtype)
+    return np.mean(data, axis=1)
 
 
 def _resample_if_needed(x: np.ndarray, orig_sr: int, target_sr: int) -> Tuple[np.ndarray, int]:
     if target_sr is None or orig_sr == target_sr:
         return x, orig_sr
-    # scipy.signal.resample을 이용한 간단한 리샘플링
     new_len = int(round(len(x) * (target_sr / float(orig_sr))))
     if new_len <= 0:
         return x, orig_sr
-    if x.ndim == 1:
-        y = signal.resample(x, new_len)
+    # 정수비 up/down으로 표현되면 폴리페이즈 FIR(resample_poly) 사용:
+    # FFT 기반 resample은 길이가 소수 인수를 가지면 비용이 급격히 커진다.
+    # 다중 채널은 axis=0으로 한 번에 처리한다.
+    ratio = Fraction(int(target_sr), int(orig_sr))
+    if ratio.denominator <= 1000:
+        y = signal.resample_poly(x, ratio.numerator, ratio.denominator, axis=0)
     else:
-        # 다중 채널이면 채널별로 리샘플
-        chans = []
-        for ch in range(x.shape[1]):
-            chans.append(signal.resample(x[:, ch], new_len))
-        y = np.stack(chans, axis=1)
-    return y.astype(np.float32), target_sr
+        # 비율이 너무 복잡하면 FFT 기반 resample로 대체
+        y = signal.resample(x, new_len, axis=0)
+    # resample_poly는 float32 입력이면 float32를 돌려주므로 이때는 복사하지 않는다
+    return y.astype(np.float32, copy=False), target_sr
 
 
 def load_audio(path: str, target_sr: int = 44100, mono: bool = True) -> Tuple[np.ndarray, int]:
@@ -71,9 +101,9 @@ def load_audio(path: str, target_sr: int = 44100, mono: bool = True) -> Tuple[np
     # WAV는 scipy로 처리
     if ext == ".wav":
         sr, data = wavfile.read(path)
-        data = _to_float32(data)
         if mono and data.ndim > 1:
-            data = np.mean(data, axis=1)
+            data = _downmix(data)
+        data = _to_float32(data)
         data, sr = _resample_if_needed(data, sr, target_sr)
         return data, sr
 
@@ -92,6 +122,8 @@ def load_audio(path: str, target_sr: int = 44100, mono: bool = True) -> Tuple[np
             "ffmpeg",
             "-v",
             "error",
+            "-threads",
+            "0",
             "-i",
             path,
             "-f",
@@ -105,21 +137,29 @@ def load_audio(path: str, target_sr: int = 44100, mono: bool = True) -> Tuple[np
             cmd += ["-ar", str(int(target_sr))]
         cmd += ["-"]
 
-        try:
-            proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True)
-        except subprocess.CalledProcessError as e:
-            stderr = e.stderr.decode("utf-8", errors="ignore") if hasattr(e, "stderr") else ""
-            raise RuntimeError(f"ffmpeg 실행 실패: {stderr}")
-
-        raw = proc.stdout
-        # s16le -> int16
-        arr = np.frombuffer(raw, dtype=np.int16)
+        # stdout을 1MB 단위로 스트리밍해 bytearray 하나에 누적한다 (전체 PCM을
+        # bytes로 한 번 더 보관하지 않음). stderr는 임시 파일로 받아 파이프가 가득 차
+        # 교착되는 일을 막는다.
+        buf = bytearray()
+        with tempfile.TemporaryFile() as err_file:
+            with subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=err_file, bufsize=0) as proc:
+                read = proc.stdout.read
+                while True:
+                    chunk = read(1 << 20)
+                    if not chunk:
+                        break
+                    buf.extend(chunk)
+            if proc.returncode != 0:
+                err_file.seek(0)
+                stderr = err_file.read().decode("utf-8", errors="ignore")
+                raise RuntimeError(f"ffmpeg 실행 실패: {stderr}")
+
+        # s16le -> int16 (bytearray 메모리를 그대로 공유, 불완전한 끝 샘플은 버림)
+        usable = len(buf) - len(buf) % (2 * channels)
+        arr = np.frombuffer(memoryview(buf)[:usable], dtype=np.int16)
+        # mono=True면 ffmpeg가 이미 -ac 1로 다운믹스해서 내보낸다
         if channels > 1 and arr.size > 0:
-            arr = arr.reshape(-1, channels)
-            if mono:
-                data = np.mean(arr, axis=1)
-            else:
-                data = arr
+            data = arr.reshape(-1, channels)
         else:
             data = arr
 
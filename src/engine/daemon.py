@@ -4,6 +4,7 @@
 - systemd에서 계속 실행될 수 있도록 설계
 - 오디오 입력이 없으면 샘플 sine 파형을 생성하여 데모 모드로 동작
 - 30fps realtime loop를 무한으로 유지
+  (오디오 생산 스레드 -> bounded queue -> 특징/모드/송출 소비 루프)
 - 설정 파일(config/settings.py)을 로드하여 ModeManager/HighlightDetector 초기화
 - 시뮬레이터(픽셀/DMX)에 모드와 강도를 전달
 
@@ -11,12 +12,17 @@
 """
 from __future__ import annotations
 
+from fractions import Fraction
 from typing import Any
+import math
+import queue
+import threading
 import time
 import logging
 import signal
 
 import numpy as np
+from scipy.fft import next_fast_len, rfft
 
 from config import settings
 from src.engine.features import extract_features
@@ -26,49 +32,78 @@ from src.engine.outputs.udp_pixel_sender import UDPPixelSender
 from src.web import config_manager
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(
-    level=logging.INFO,
-    format="[%(asctime)s] %(name)s - %(levelname)s - %(message)s"
-)
 
 
-def _adjust_payload_intensity(pixel_data: bytes, intensity: float) -> bytes:
-    """픽셀 데이터의 밝기(intensity)를 조정한다.
+def _band_edges(n: int, sr: int) -> tuple[int, int, int]:
+    """rfft 빈 인덱스 기준 밴드 경계 (20 / 300 / 2000 Hz)를 반환한다.
 
-    Args:
-        pixel_data: RGB 바이트 시퀀스
-        intensity: 0..1 범위 강도 배수
+    주파수 축이 단조 증가하므로 searchsorted로 구한 경계로 연속 슬라이스를 만들 수 있다:
+      low: [i20:i300), mid: [i300:i2000), high: [i2000:]
+    """
+    freqs = np.fft.rfftfreq(n, d=1.0 / sr)
+    i20, i300, i2000 = np.searchsorted(freqs, [20, 300, 2000])
+    return int(i20), int(i300), int(i2000)
 
-    Returns:
-        조정된 픽셀 데이터
+
+def _spectrum_reductions(
+    mag: np.ndarray, prev_mag: np.ndarray | None, band_edges: tuple[int, int, int]
+) -> tuple[float, float, float, float, float, float]:
+    """진폭 스펙트럼에서 필요한 합들을 한 번에 계산한다.
+
+    반환: (total, low, mid, high, flux_num, prev_sum)
+
+    밴드 합과 전체 합은 `np.add.reduceat` 한 번으로(세그먼트 합의 합 = total),
+    flux 분자는 차이 배열 하나를 제자리 clip해서 구한다. 합마다 배열을 다시
+    훑던 6회 순회를 3회로 줄인다.
     """
-    intensity = max(0.0, min(1.0, intensity))
-    if intensity == 1.0:
-        return pixel_data
+    i20, i300, i2000 = band_edges
+    if 0 < i20 < i300 < i2000 < mag.size:
+        below, low, mid, high = np.add.reduceat(mag, (0, i20, i300, i2000)).tolist()
+        total = below + low + mid + high
+    else:
+        # 프레임이 매우 짧아 경계가 겹치면 슬라이스 합으로 처리 (빈 슬라이스는 0)
+        total = float(mag.sum())
+        low = float(mag[i20:i300].sum())
+        mid = float(mag[i300:i2000].sum())
+        high = float(mag[i2000:].sum())
+
+    if prev_mag is None or prev_mag.shape != mag.shape:
+        return total, low, mid, high, 0.0, 0.0
 
-    arr = bytearray(pixel_data)
-    for i in range(0, len(arr), 3):
-        r = int(arr[i] * intensity) & 0xFF
-        g = int(arr[i + 1] * intensity) & 0xFF
-        b = int(arr[i + 2] * intensity) & 0xFF
-        arr[i] = r
-        arr[i + 1] = g
-        arr[i + 2] = b
-    return bytes(arr)
+    diff = mag - prev_mag
+    np.maximum(diff, 0.0, out=diff)
+    return total, low, mid, high, float(diff.sum()), float(prev_mag.sum())
 
 
 def _frame_features_from_buffer(
-    frame: np.ndarray, sr: int, prev_mag: np.ndarray | None = None
+    frame: np.ndarray,
+    sr: int,
+    prev_mag: np.ndarray | None = None,
+    win: np.ndarray | None = None,
+    band_edges: tuple[int, int, int] | None = None,
+    n_fft: int | None = None,
+    scratch: np.ndarray | None = None,
 ) -> tuple[dict[str, float], np.ndarray | None]:
     """간단한 프레임 기반 특징 계산 (실시간 목표, 가벼운 연산).
 
     반환: (feat_dict, curr_mag)
     feat keys: rms, band_low, band_mid, band_high, flux
+
+    `curr_mag`는 진폭 스펙트럼(|X|)이다. 밴드 비율과 flux의 임계값
+    (SPEECH_MID_PROP, MUSIC_HIGH_PROP, 하이라이트 flux 스케일)은 진폭 기준으로
+    맞춰져 있으므로 파워(|X|^2)로 바꾸면 안 된다 (톤 성분이 과대평가되어 고음/잡음
+    비율이 크게 줄어듦).
+
+    `win`, `band_edges`, `n_fft`는 프레임 길이가 고정된 루프에서 미리 계산해
+    넘길 수 있다 (None이면 매 호출마다 계산). `n_fft`가 프레임보다 길면 제로패딩된다.
+    `scratch`(프레임 길이 버퍼)를 주면 윈도잉 결과를 새로 할당하지 않고 그 버퍼에 쓴다.
     """
-    # RMS
-    rms = float(np.sqrt(np.mean(frame.astype(np.float64) ** 2))) if frame.size > 0 else 0.0
+    # RMS: float32 프레임이면 BLAS sdot 한 번 (float64 업캐스트/제곱 임시 배열 없음)
+    rms = float(np.sqrt(np.dot(frame, frame) / frame.size)) if frame.size > 0 else 0.0
 
     # FFT 기반 대역 에너지 비율
+    # RMS가 임계값보다 낮아도 FFT는 생략하지 않는다: ModeManager는 SPEECH를 band_mid만으로
+    # 점수화하므로, 조용한 중역 신호의 밴드 비율을 0으로 바꾸면 판정이 달라진다.
     n = len(frame)
     if n <= 0:
         return (
@@ -77,27 +112,29 @@ def _frame_features_from_buffer(
         )
 
     # 윈도잉
-    win = np.hanning(n)
-    spec = np.fft.rfft(frame * win)
+    if win is None:
+        win = np.hanning(n)
+    if n_fft is None:
+        n_fft = n
+    if band_edges is None:
+        band_edges = _band_edges(n_fft, sr)
+    # scipy.fft(pocketfft)는 길이별 플랜을 캐시하므로 두 번째 프레임부터 셋업 비용이 없다
+    if scratch is not None:
+        # rfft는 입력을 다 읽은 뒤 출력을 새로 만들므로 scratch 재사용이 안전하다
+        windowed = np.multiply(frame, win, out=scratch)
+    else:
+        windowed = frame * win
+    spec = rfft(windowed, n=n_fft)
     mag = np.abs(spec)
-    freqs = np.fft.rfftfreq(n, d=1.0 / sr)
-
-    total = mag.sum() + 1e-12
-    low_idx = (freqs >= 20) & (freqs < 300)
-    mid_idx = (freqs >= 300) & (freqs < 2000)
-    high_idx = freqs >= 2000
 
-    low_e = float(mag[low_idx].sum() / total) if low_idx.any() else 0.0
-    mid_e = float(mag[mid_idx].sum() / total) if mid_idx.any() else 0.0
-    high_e = float(mag[high_idx].sum() / total) if high_idx.any() else 0.0
+    total, low, mid, high, flux_num, prev_sum = _spectrum_reductions(mag, prev_mag, band_edges)
+    total += 1e-12
+    low_e = low / total
+    mid_e = mid / total
+    high_e = high / total
 
-    # spectral flux (양의 변화 합)
-    if prev_mag is None or prev_mag.shape != mag.shape:
-        flux = 0.0
-    else:
-        diff = mag - prev_mag
-        pos = diff.clip(min=0.0)
-        flux = float(pos.sum() / (prev_mag.sum() + 1e-12))
+    # spectral flux (양의 변화 합, 이전 프레임이 없으면 0)
+    flux = flux_num / (prev_sum + 1e-12)
 
     feat = {"rms": rms, "band_low": low_e, "band_mid": mid_e, "band_high": high_e, "flux": flux}
     return feat, mag
@@ -130,25 +167,41 @@ class DaemonLoop:
                 "MUSIC_ONSET_DENSITY": settings.MUSIC_ONSET_DENSITY,
             }
         )
-        self.detector = HighlightDetector(
-            {
-                "HIGHLIGHT_THRESHOLD": settings.HIGHLIGHT_THRESHOLD,
-                "DROP_THRESHOLD": settings.DROP_THRESHOLD,
-                "HIGHLIGHT_HYSTERESIS": settings.HIGHLIGHT_HYSTERESIS,
-                "HIGHLIGHT_COOLDOWN_SECONDS": settings.HIGHLIGHT_COOLDOWN_SECONDS,
-                "HIGHLIGHT_WEIGHT_RMS": settings.HIGHLIGHT_WEIGHT_RMS,
-                "HIGHLIGHT_WEIGHT_BAND_HIGH": settings.HIGHLIGHT_WEIGHT_BAND_HIGH,
-                "HIGHLIGHT_WEIGHT_FLUX": settings.HIGHLIGHT_WEIGHT_FLUX,
-            }
-        )
+        self._detector_settings = {
+            "HIGHLIGHT_THRESHOLD": settings.HIGHLIGHT_THRESHOLD,
+            "DROP_THRESHOLD": settings.DROP_THRESHOLD,
+            "HIGHLIGHT_HYSTERESIS": settings.HIGHLIGHT_HYSTERESIS,
+            "HIGHLIGHT_COOLDOWN_SECONDS": settings.HIGHLIGHT_COOLDOWN_SECONDS,
+            "HIGHLIGHT_WEIGHT_RMS": settings.HIGHLIGHT_WEIGHT_RMS,
+            "HIGHLIGHT_WEIGHT_BAND_HIGH": settings.HIGHLIGHT_WEIGHT_BAND_HIGH,
+            "HIGHLIGHT_WEIGHT_FLUX": settings.HIGHLIGHT_WEIGHT_FLUX,
+        }
+        self.detector = HighlightDetector(self._detector_settings)
 
         self.sender = UDPPixelSender()
-        self.demo_time = 0.0
         self.frame_duration = 1.0 / self.fps
         self.prev_mag = None
         self.frames = 0
+        self.dropped_frames = 0
+        self._producer_failed = False
+
+        # 오디오 생산자 -> 소비자 큐. 작게 유지해 부하 시 지연이 쌓이지 않게 한다
+        # (가득 차면 가장 오래된 프레임을 버림)
+        # None은 생산 스레드 종료 신호
+        self._frame_queue: queue.Queue[tuple[np.ndarray, float] | None] = queue.Queue(maxsize=2)
+
+        # 프레임 길이가 고정이므로 윈도우/FFT 길이/밴드 경계를 한 번만 계산
+        # 실시간 경로(main._hann)와 같은 대칭 Hann 창을 써서 두 경로의 특징 값을 맞춘다
+        self._win = np.hanning(self.samples_per_frame).astype(np.float32)
+        self._scratch = np.empty(self.samples_per_frame, dtype=np.float32)
+        self._nfft = next_fast_len(self.samples_per_frame, real=True)
+        self._band_edges = _band_edges(self._nfft, self.sr)
         self._last_cfg_mtime = None
 
+        # 데모 sine은 정수 주기 버퍼를 한 번만 만들어 두고 슬라이스로 순환
+        self._demo_period, self._demo_buf = self._build_demo_buffer()
+        self._demo_pos = 0
+
         logger.info(f"데몬 루프 초기화됨 (FPS: {self.fps}, 샘플레이트: {self.sr})")
 
     def _signal_handler(self, signum: int, frame: Any) -> None:
@@ -156,20 +209,84 @@ class DaemonLoop:
         logger.info(f"신호 {signum} 수신, 종료 중...")
         self.running = False
 
+    def _build_demo_buffer(self) -> tuple[int, np.ndarray]:
+        """데모 sine 순환 버퍼 생성
+
+        sr / demo_freq를 기약분수 p/q로 나타내면 p 샘플에 정확히 q 주기가 들어가므로
+        위상이 끊기지 않는다 (예: 44100 / 440 -> 2205 샘플 = 22 주기). 주기가 1초보다
+        길어지면 1초로 자른다 (데모 용도이므로 위상 점프 허용).
+        버퍼 길이는 p + samples_per_frame으로 잡아, 어떤 시작 위치에서도 프레임을
+        복사 없이 연속 슬라이스로 꺼낼 수 있게 한다.
+        """
+        freq = Fraction(self.demo_freq).limit_denominator(1000)
+        period = (self.sr * freq.denominator) // math.gcd(self.sr * freq.denominator, freq.numerator)
+        period = max(1, min(period, self.sr))
+        t = np.arange(period + self.samples_per_frame) / self.sr
+        buf = (0.3 * np.sin(2 * np.pi * self.demo_freq * t)).astype(np.float32)
+        buf.flags.writeable = False
+        return period, buf
+
     def _generate_demo_frame(self) -> np.ndarray:
-        """데모용 sine 파형 프레임 생성"""
-        t = np.arange(self.samples_per_frame) / self.sr + self.demo_time
-        frame = 0.3 * np.sin(2 * np.pi * self.demo_freq * t).astype(np.float32)
-        return frame
+        """데모용 sine 파형 프레임 반환 (미리 계산한 버퍼의 읽기 전용 뷰)"""
+        start = self._demo_pos
+        self._demo_pos = (start + self.samples_per_frame) % self._demo_period
+        return self._demo_buf[start : start + self.samples_per_frame]
+
+    def _put_latest(self, item: tuple[np.ndarray, float] | None) -> None:
+        """큐에 넣되, 소비자가 밀려 가득 차 있으면 가장 오래된 프레임을 버리고 넣는다."""
+        try:
+            self._frame_queue.put_nowait(item)
+        except queue.Full:
+            try:
+                self._frame_queue.get_nowait()
+                self.dropped_frames += 1
+            except queue.Empty:
+                pass
+            self._frame_queue.put_nowait(item)
+
+    def _produce_frames(self) -> None:
+        """오디오 생산 스레드: 프레임 주기마다 (frame, 캡처 시각)을 큐에 넣는다.
+
+        절대 데드라인 스케줄링(단조 시계)으로 sleep 오버헤드/지터가 누적되지 않는다.
+        예외로 중단되면 로그를 남기고 데몬을 멈춘다. 어떤 경우든 끝날 때 종료 신호(None)를
+        넣어 소비 루프가 큐를 기다리며 멈춰 있지 않게 한다.
+        """
+        try:
+            next_deadline = time.perf_counter()
+            while self.running:
+                next_deadline += self.frame_duration
+
+                # 데모용 sine 파형 생성
+                self._put_latest((self._generate_demo_frame(), time.perf_counter()))
+
+                # 다음 데드라인까지 대기, 이미 지났으면 따라잡기 burst 없이 현재 시각으로 재기준
+                sleep_for = next_deadline - time.perf_counter()
+                if sleep_for > 0:
+                    time.sleep(sleep_for)
+                else:
+                    next_deadline = time.perf_counter()
+        except Exception as e:
+            logger.error(f"오디오 생산 스레드 오류, 데몬 중지: {e}", exc_info=True)
+            self._producer_failed = True
+            self.running = False
+        finally:
+            self._put_latest(None)
 
     def _check_config_reload(self) -> None:
-        """설정 파일 변경 감지 및 재로드"""
+        """설정 파일 변경 감지 및 재로드
+
+        재로드에 실패해도 해당 mtime은 처리한 것으로 기록해, 파일이 다시 바뀔 때까지
+        프레임마다 재시도/경고하지 않는다 (검출기는 이전 설정을 유지).
+        """
         cfg_mtime = config_manager.get_config_mtime()
         if cfg_mtime is not None and self._last_cfg_mtime != cfg_mtime:
+            self._last_cfg_mtime = cfg_mtime
             try:
                 run_cfg = config_manager.load_config()
+                # 구성 파일에 하이라이트 파라미터가 있으면 기본값 위에 덮어써 반영
+                overrides = {k: run_cfg[k] for k in self._detector_settings if k in run_cfg}
+                self.detector.reload({**self._detector_settings, **overrides})
                 logger.info("설정 파일 변경 감지, 재로드됨")
-                self._last_cfg_mtime = cfg_mtime
             except Exception as e:
                 logger.warning(f"설정 재로드 실패: {e}")
 
@@ -193,7 +310,7 @@ class DaemonLoop:
                 intensity = 0.7
 
         payload = UDPPixelSender.generate_dummy_pixel_data(pixel_count, ch)
-        payload = _adjust_payload_intensity(payload, intensity)
+        payload = UDPPixelSender.adjust_intensity(payload, intensity)
         self.sender.send_frame(
             "127.0.0.1",
             9000 + ch,
@@ -215,46 +332,58 @@ class DaemonLoop:
 
         logger.info("데몬 루프 시작")
 
+        # 오디오 생산은 별도 스레드에서 프레임 주기로 진행 (FFT/BLAS는 GIL을 놓으므로 실제로 겹친다)
+        producer = threading.Thread(target=self._produce_frames, name="daemon-audio", daemon=True)
+        producer.start()
+
         try:
             while self.running:
-                loop_start = time.time()
-
-                # 데모용 sine 파형 생성
-                frame = self._generate_demo_frame()
+                try:
+                    item = self._frame_queue.get(timeout=0.5)
+                except queue.Empty:
+                    continue
+                if item is None:
+                    # 생산 스레드 종료
+                    break
+                frame, captured_at = item
 
                 # 특징 계산
-                feat, mag = _frame_features_from_buffer(frame, self.sr, self.prev_mag)
+                feat, mag = _frame_features_from_buffer(
+                    frame,
+                    self.sr,
+                    self.prev_mag,
+                    win=self._win,
+                    band_edges=self._band_edges,
+                    n_fft=self._nfft,
+                    scratch=self._scratch,
+                )
                 self.prev_mag = mag
 
                 # 설정 재로드 확인
                 self._check_config_reload()
 
-                # 모드 및 하이라이트 상태 업데이트
-                now = time.time()
+                # 모드 및 하이라이트 상태 업데이트 (내부 타이머는 모두 단조 시계 기준,
+                # 큐 대기 시간과 무관하게 프레임 캡처 시각을 사용)
+                now = captured_at
                 mode = self.mm.update(feat, now=now)
                 hstate = self.mm.update_highlight(feat, self.detector, now=now)
 
                 # 픽셀 송출
                 self._send_pixel_frame(mode, hstate, self.frames)
 
-                # 프레임 카운터 및 시간 업데이트
+                # 프레임 카운터 업데이트
                 self.frames += 1
-                self.demo_time += self.samples_per_frame / self.sr
-
-                # 루프 타이밍 보정
-                elapsed = time.time() - loop_start
-                sleep_for = self.frame_duration - elapsed
-                if sleep_for > 0:
-                    time.sleep(sleep_for)
 
         except Exception as e:
             logger.error(f"데몬 루프 오류: {e}", exc_info=True)
             return 1
         finally:
+            self.running = False
+            producer.join(timeout=1.0)
             self.sender.close()
-            logger.info(f"데몬 종료 (처리 프레임: {self.frames})")
+            logger.info(f"데몬 종료 (처리 프레임: {self.frames}, 드롭: {self.dropped_frames})")
 
-        return 0
+        return 1 if self._producer_failed else 0
 
 
 def run_daemon(target_fps: int | None = None) -> int:
@@ -276,5 +405,11 @@ def run_daemon(target_fps: int | None = None) -> int:
 if __name__ == "__main__":
     import sys
 
+    # 로깅 설정은 실행 진입점에서만 한다 (모듈 import 시 전역 로깅을 바꾸지 않음)
+    logging.basicConfig(
+        level=logging.INFO,
+        format="[%(asctime)s] %(name)s - %(levelname)s - %(message)s"
+    )
+
     exit_code = run_daemon()
     sys.exit(exit_code)
@@ -23,6 +23,19 @@ from typing import Optional
 from enum import Enum
 
 
+def _seconds_to_ns(seconds: float) -> int:
+    return int(round(seconds * 1_000_000_000))
+
+
+def _now_ns(now: Optional[float], now_ns: Optional[int]) -> int:
+    """시각 인자를 정수 나노초로 통일 (now_ns 우선, 초 단위 now 호환, 없으면 monotonic 시계)"""
+    if now_ns is not None:
+        return int(now_ns)
+    if now is not None:
+        return _seconds_to_ns(now)
+    return time.monotonic_ns()
+
+
 class FailsafeState(Enum):
     """장애 안전 상태 정의"""
     NORMAL = "normal"
@@ -38,6 +51,9 @@ class FailsafeManager:
       1. on_frame_sent(): 프레임 송출 성공 시 (장애 타이머 리셋)
       2. on_frame_fail(): 프레임 송출 실패 시 (타이머 시작)
       3. get_intensity(): 현재 강도(0..1)를 조회
+
+    시각은 정수 나노초(now_ns)로 받는 것이 기본이다. 초 단위 float(now)도 받아
+    나노초로 변환하며, 둘 다 없으면 time.monotonic_ns()를 사용한다.
     """
 
     def __init__(
@@ -62,31 +78,35 @@ class FailsafeManager:
         self.ambient_intensity = float(ambient_intensity)
         self.recovery_hold_seconds = float(recovery_hold_seconds)
 
-        self._failure_time: Optional[float] = None
-        self._recovery_time: Optional[float] = None
+        # 구간 경계는 정수 나노초로 미리 계산 (프레임마다 float 덧셈/비교 누적 오차 없음)
+        self._hold_ns = _seconds_to_ns(self.hold_seconds)
+        self._ambient_end_ns = self._hold_ns + _seconds_to_ns(self.ambient_seconds)
+        self._black_ns = _seconds_to_ns(self.black_seconds)
+        self._black_end_ns = self._ambient_end_ns + self._black_ns
+
+        self._failure_ns: Optional[int] = None
+        self._recovery_ns: Optional[int] = None
         self.state = FailsafeState.NORMAL
 
-    def on_frame_sent(self, now: Optional[float] = None) -> None:
+    def on_frame_sent(self, now: Optional[float] = None, *, now_ns: Optional[int] = None) -> None:
         """프레임 송출 성공: 장애 해제 및 recovery 상태 진입.
 
         장애 중이었다면 recovery 신호로 해제되고, NORMAL 상태로 복귀.
         플래핑 방지를 위해 recovery_hold_seconds 동안 안정화 기간 추적 (선택적 사용).
         """
-        now = now if now is not None else time.time()
-        if self._failure_time is not None:
+        if self._failure_ns is not None:
             # 기존 장애를 recovery 신호로 해제
-            self._failure_time = None
-            self._recovery_time = now
+            self._failure_ns = None
+            self._recovery_ns = _now_ns(now, now_ns)
             self.state = FailsafeState.NORMAL
 
-    def on_frame_fail(self, now: Optional[float] = None) -> None:
+    def on_frame_fail(self, now: Optional[float] = None, *, now_ns: Optional[int] = None) -> None:
         """프레임 송출 실패: 장애 카운터 시작, LAST_HOLD 상태 진입"""
-        now = now if now is not None else time.time()
-        if self._failure_time is None:
-            self._failure_time = now
+        if self._failure_ns is None:
+            self._failure_ns = _now_ns(now, now_ns)
             self.state = FailsafeState.LAST_HOLD
 
-    def get_intensity(self, now: Optional[float] = None) -> float:
+    def get_intensity(self, now: Optional[float] = None, *, now_ns: Optional[int] = None) -> float:
         """현재 강도를 반환 (0..1).
 
         - NORMAL: 1.0
@@ -94,25 +114,23 @@ class FailsafeManager:
         - DIM_AMBIENT: ambient_intensity로 감쇠
         - DIM_BLACK: 0.0으로 선형 감쇠
         """
-        now = now if now is not None else time.time()
-
-        if self._failure_time is None:
+        if self._failure_ns is None:
             self.state = FailsafeState.NORMAL
             return 1.0
 
-        elapsed = now - self._failure_time
+        elapsed = _now_ns(now, now_ns) - self._failure_ns
 
-        # 상태 결정
-        if elapsed < self.hold_seconds:
+        # 상태 결정 (정수 나노초 비교)
+        if elapsed < self._hold_ns:
             self.state = FailsafeState.LAST_HOLD
             return 1.0
-        elif elapsed < self.hold_seconds + self.ambient_seconds:
+        elif elapsed < self._ambient_end_ns:
             self.state = FailsafeState.DIM_AMBIENT
             return self.ambient_intensity
-        elif self.black_seconds > 0 and elapsed < self.hold_seconds + self.ambient_seconds + self.black_seconds:
+        elif self._black_ns > 0 and elapsed < self._black_end_ns:
             self.state = FailsafeState.DIM_BLACK
             # 선형 감쇠: ambient_intensity -> 0.0
-            progress = (elapsed - self.hold_seconds - self.ambient_seconds) / self.black_seconds
+            progress = (elapsed - self._ambient_end_ns) / self._black_ns
             return self.ambient_intensity * (1.0 - progress)
         else:
             # 전체 시간 경과: 완전히 꺼짐
@@ -11,7 +11,10 @@
 """
 from __future__ import annotations
 
+import functools
+
 import numpy as np
+from scipy import fft as sp_fft
 from scipy import signal
 from typing import Dict, Any, Tuple
 
@@ -26,9 +29,51 @@ def frames_from_signal(x: np.ndarray, sr: int, frame_ms: int, hop_ms: int) -> Tu
     return frame_len, hop_len
 
 
-def compute_spectrogram(x: np.ndarray, sr: int, n_fft: int, hop_length: int) -> Tuple[np.ndarray, np.ndarray]:
-    f, t, Z = signal.stft(x, fs=sr, nperseg=n_fft, noverlap=n_fft - hop_length, boundary=None)
-    S = np.abs(Z)
+def _frame_view(x: np.ndarray, width: int, hop: int, n_frames: int | None = None) -> np.ndarray:
+    """신호를 (n_frames, width) strided 뷰로 프레이밍 (복사 없음, 짧으면 제로패딩)
+
+    `n_frames`를 주면 그 프레임 수가 나오도록 끝을 0으로 채운다 (scipy.signal.stft의
+    `padded=True`처럼 마지막 불완전 프레임을 살릴 때 사용, 이때만 신호를 복사한다).
+    """
+    x = np.asarray(x, dtype=np.float32)
+    need = width if n_frames is None else (n_frames - 1) * hop + width
+    if len(x) < need:
+        x = np.pad(x, (0, need - len(x)))
+    view = np.lib.stride_tricks.sliding_window_view(x, width)[::hop]
+    return view if n_frames is None else view[:n_frames]
+
+
+def _stft_frame_count(n: int, n_fft: int, hop: int) -> int:
+    """scipy.signal.stft(boundary=None, padded=True)의 프레임 수 (끝의 불완전 프레임 포함)"""
+    if n <= n_fft:
+        return 1
+    return -(-(n - n_fft) // hop) + 1
+
+
+@functools.lru_cache(maxsize=4)
+def _stft_window(n_fft: int) -> np.ndarray:
+    """STFT용 periodic Hann 윈도우 (scipy.signal.stft 기본값과 동일)"""
+    return signal.get_window("hann", n_fft).astype(np.float32)
+
+
+def compute_spectrogram(
+    x: np.ndarray, sr: int, n_fft: int, hop_length: int, frames: np.ndarray | None = None
+) -> Tuple[np.ndarray, np.ndarray]:
+    """STFT 진폭 스펙트로그램 |Z| (freq_bins, n_frames) 계산
+
+    밴드 비율, spectral flux, onset 임계값(0.02)은 모두 진폭 기준으로 맞춰져 있으므로
+    파워(|Z|^2)를 돌려주면 안 된다 (톤 성분이 과대평가됨).
+    신호를 strided 뷰로 프레이밍하고 윈도우를 곱한 뒤 rfft를 한 번에 호출한다.
+    끝의 불완전 프레임은 scipy.signal.stft(padded=True)처럼 0으로 채워 포함한다.
+    프레임별 FFT는 서로 독립이므로 `workers=-1`로 모든 코어에 나눠 처리한다.
+
+    `frames`: 같은 hop으로 미리 만든 (n_frames, >= n_fft) 프레임 뷰 (RMS와 공유용)
+    """
+    if frames is None:
+        frames = _frame_view(x, n_fft, hop_length, _stft_frame_count(len(x), n_fft, hop_length))
+    Z = sp_fft.rfft(frames[:, :n_fft] * _stft_window(n_fft), axis=-1, workers=-1)
+    S = np.abs(Z).T
+    f = np.fft.rfftfreq(n_fft, d=1.0 / sr)
     return f, S
 
 
@@ -39,16 +84,16 @@ def band_energy_from_spectrogram(f: np.ndarray, S: np.ndarray) -> Dict[str, np.n
       low: 20-300 Hz
       mid: 300-2000 Hz
       high: 2000+ Hz
+
+    `f`는 단조 증가하므로 searchsorted 경계로 연속 슬라이스(복사 없는 뷰)를 합산한다.
     """
-    low_idx = np.where((f >= 20) & (f < 300))[0]
-    mid_idx = np.where((f >= 300) & (f < 2000))[0]
-    high_idx = np.where(f >= 2000)[0]
+    i20, i300, i2000 = np.searchsorted(f, [20, 300, 2000])
 
-    # 각 프레임 별 에너지
-    total = np.sum(S, axis=0) + 1e-12
-    low_e = np.sum(S[low_idx, :], axis=0) if low_idx.size else np.zeros(S.shape[1])
-    mid_e = np.sum(S[mid_idx, :], axis=0) if mid_idx.size else np.zeros(S.shape[1])
-    high_e = np.sum(S[high_idx, :], axis=0) if high_idx.size else np.zeros(S.shape[1])
+    # 각 프레임 별 에너지 (빈 슬라이스의 합은 0)
+    total = S.sum(axis=0) + 1e-12
+    low_e = S[i20:i300].sum(axis=0)
+    mid_e = S[i300:i2000].sum(axis=0)
+    high_e = S[i2000:].sum(axis=0)
 
     return {
         "low": low_e / total,
@@ -57,30 +102,45 @@ def band_energy_from_spectrogram(f: np.ndarray, S: np.ndarray) -> Dict[str, np.n
     }
 
 
-def compute_rms(x: np.ndarray, frame_len: int, hop_len: int) -> np.ndarray:
-    """프레임별 RMS 계산"""
-    # 제로 패딩
-    n_frames = max(1, 1 + (len(x) - frame_len) // hop_len) if len(x) >= frame_len else 1
-    rms = np.zeros(n_frames)
-    for i in range(n_frames):
-        start = i * hop_len
-        frame = x[start: start + frame_len]
-        if frame.size == 0:
-            rms[i] = 0.0
-        else:
-            rms[i] = np.sqrt(np.mean(frame.astype(np.float64) ** 2))
-    return rms
+def compute_rms(
+    x: np.ndarray, frame_len: int, hop_len: int, frames: np.ndarray | None = None
+) -> np.ndarray:
+    """프레임별 RMS 계산
+
+    `sliding_window_view`로 (n_frames, frame_len) 뷰를 만들고 einsum 한 번으로
+    프레임별 제곱합을 구한다 (파이썬 루프/복사 없음).
+
+    `frames`: 같은 hop으로 미리 만든 (n_frames, >= frame_len) 프레임 뷰 (STFT와 공유용)
+    """
+    if frames is not None:
+        W = frames[:, :frame_len]
+        return np.sqrt(np.einsum("ij,ij->i", W, W, dtype=np.float64) / frame_len)
+
+    x = np.asarray(x, dtype=np.float32)
+    # 신호가 프레임보다 짧으면 전체를 한 프레임으로 취급
+    if len(x) < frame_len:
+        if x.size == 0:
+            return np.zeros(1)
+        return np.array([np.sqrt(np.einsum("i,i->", x, x, dtype=np.float64) / x.size)])
+
+    W = np.lib.stride_tricks.sliding_window_view(x, frame_len)[::hop_len]
+    return np.sqrt(np.einsum("ij,ij->i", W, W, dtype=np.float64) / frame_len)
 
 
 def spectral_flux(S: np.ndarray) -> np.ndarray:
-    """스펙트럼 플럭스: 연속 프레임간 양의 변화 합"""
+    """스펙트럼 플럭스: 연속 프레임간 양의 변화 합 (S는 진폭 스펙트로그램)
+
+    정규화 스펙트럼과 차이 배열 두 개만 만들고, clip은 차이 배열에 제자리로
+    적용한다 (diff/clip/concatenate 임시 배열 없음).
+    """
     # 정규화된 스펙트럼
-    S_norm = S / (np.sum(S, axis=0, keepdims=True) + 1e-12)
-    diff = np.diff(S_norm, axis=1)
-    pos_diff = np.clip(diff, a_min=0, a_max=None)
-    flux = np.sum(pos_diff, axis=0)
+    S_norm = S / (S.sum(axis=0) + 1e-12)
     # 첫 프레임은 0
-    flux = np.concatenate(([0.0], flux))
+    flux = np.zeros(S.shape[1], dtype=S_norm.dtype)
+    if S.shape[1] > 1:
+        diff = np.subtract(S_norm[:, 1:], S_norm[:, :-1])
+        np.maximum(diff, 0.0, out=diff)
+        diff.sum(axis=0, out=flux[1:])
     return flux
 
 
@@ -107,14 +167,24 @@ def extract_features(x: np.ndarray, sr: int, settings: Dict[str, Any]) -> Dict[s
     n_fft = settings.get("N_FFT", 2048)
 
     frame_len, hop_len = frames_from_signal(x, sr, frame_ms, hop_ms)
-    f, S = compute_spectrogram(x, sr, n_fft, hop_len)
+    # RMS와 STFT가 같은 hop의 프레임 뷰 하나를 공유한다.
+    # 프레임 수는 RMS 프레임 수와 STFT(끝 제로패딩 포함) 프레임 수 중 작은 쪽이다.
+    # frame_len < n_fft이면 STFT의 패딩된 마지막 프레임이 필요할 수 있으므로 뷰 끝을 0으로 채운다
+    # (RMS는 각 프레임의 앞 frame_len 샘플만 읽으므로 패딩의 영향을 받지 않는다).
+    # 신호가 RMS 프레임이나 FFT 길이보다 짧으면 RMS는 기존처럼 신호 전체로 계산한다.
+    width = max(frame_len, n_fft)
+    frames = None
+    if len(x) >= frame_len and len(x) >= n_fft:
+        n_shared = min((len(x) - frame_len) // hop_len + 1, _stft_frame_count(len(x), n_fft, hop_len))
+        frames = _frame_view(x, width, hop_len, n_shared)
+    f, S = compute_spectrogram(x, sr, n_fft, hop_len, frames=frames)
 
     # 시간 축
     n_frames = S.shape[1]
     times = np.arange(n_frames) * (hop_len / sr)
 
     band = band_energy_from_spectrogram(f, S)
-    rms = compute_rms(x, frame_len, hop_len)
+    rms = compute_rms(x, frame_len, hop_len, frames=frames)
     # rms 길이와 스펙트럼 프레임 길이 다를 수 있으므로 맞춤
     min_len = min(len(rms), n_frames)
     rms = rms[:min_len]
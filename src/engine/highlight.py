@@ -25,9 +25,38 @@ class HighlightDetector:
     STATES = ("IDLE", "HIGHLIGHT", "DROP")
 
     def __init__(self, settings: Dict[str, Any]):
-        self.settings = settings
         self.state = "IDLE"
         self._last_transition_time = None
+        self.reload(settings)
+
+    def reload(self, settings: Dict[str, Any]) -> None:
+        """설정을 교체하고 임계값/가중치 스냅샷을 갱신한다 (상태는 유지).
+
+        프레임마다 dict에서 읽지 않도록 모든 파라미터를 float 속성으로 꺼내 둔다.
+        설정 핫 리로드 시 호출한다. 숫자로 바꿀 수 없는 값이 있으면 ValueError/TypeError를
+        내고 기존 설정은 그대로 둔다.
+        """
+        values = (
+            float(settings.get("HIGHLIGHT_THRESHOLD", 0.65)),
+            float(settings.get("DROP_THRESHOLD", 0.25)),
+            float(settings.get("HIGHLIGHT_HYSTERESIS", 0.08)),
+            float(settings.get("HIGHLIGHT_COOLDOWN_SECONDS", 0.3)),
+            float(settings.get("HIGHLIGHT_WEIGHT_RMS", 0.3)),
+            float(settings.get("HIGHLIGHT_WEIGHT_BAND_HIGH", 0.3)),
+            float(settings.get("HIGHLIGHT_WEIGHT_FLUX", 0.4)),
+        )
+        self.settings = settings
+        (
+            self._threshold,
+            self._drop_thresh,
+            self._hyst,
+            self._cooldown,
+            self._w_rms,
+            self._w_high,
+            self._w_flux,
+        ) = values
+        total_weight = self._w_rms + self._w_high + self._w_flux
+        self._w_sum = total_weight if total_weight > 0 else 1.0
 
     def compute_score(self, feat: Dict[str, float]) -> float:
         """특징값들로부터 하이라이트 점수를 계산한다 (0..1 범위).
@@ -42,25 +71,14 @@ class HighlightDetector:
         band_high = float(feat.get("band_high", 0.0))
         flux = float(feat.get("flux", 0.0))
 
-        # 각 특징을 0..1 범위로 정규화
-        # rms: 임의의 상한을 0.1로 가정
-        rms_norm = min(1.0, rms / 0.1)
-        # band_high: 이미 비율이므로 그대로
-        high_norm = band_high
-        # flux: 임의의 상한을 0.5로 가정
-        flux_norm = min(1.0, flux / 0.5)
-
-        # 가중합
-        w_rms = self.settings.get("HIGHLIGHT_WEIGHT_RMS", 0.3)
-        w_high = self.settings.get("HIGHLIGHT_WEIGHT_BAND_HIGH", 0.3)
-        w_flux = self.settings.get("HIGHLIGHT_WEIGHT_FLUX", 0.4)
-
-        total_weight = w_rms + w_high + w_flux
-        if total_weight <= 0:
-            total_weight = 1.0
-
-        score = (w_rms * rms_norm + w_high * high_norm + w_flux * flux_norm) / total_weight
-        return float(min(1.0, max(0.0, score)))
+        # 각 특징을 0..1 범위로 정규화한 가중합
+        # rms: 임의의 상한 0.1 (x10), band_high: 이미 비율, flux: 임의의 상한 0.5 (x2)
+        score = (
+            self._w_rms * min(1.0, rms * 10.0)
+            + self._w_high * band_high
+            + self._w_flux * min(1.0, flux * 2.0)
+        ) / self._w_sum
+        return 0.0 if score < 0.0 else (1.0 if score > 1.0 else score)
 
     def update(self, feat: Dict[str, float], mode: str, now: float | None = None) -> str:
         """특징값을 받아 상태를 업데이트하고 반환한다.
@@ -80,14 +98,18 @@ class HighlightDetector:
             self.state = "IDLE"
             return self.state
 
-        self._last_transition_time = self._last_transition_time or now
+        # 0.0도 유효한 시각이므로 None일 때만 초기화
+        if self._last_transition_time is None:
+            self._last_transition_time = now
+
+        # 쿨다운 체크 (점수 계산 전에 확인)
+        if now - self._last_transition_time < self._cooldown:
+            return self.state
 
         score = self.compute_score(feat)
-        threshold = self.settings.get("HIGHLIGHT_THRESHOLD", 0.65)
-        drop_thresh = self.settings.get("DROP_THRESHOLD", 0.25)
-        hyst = self.settings.get("HIGHLIGHT_HYSTERESIS", 0.08)
-        cooldown = self.settings.get("HIGHLIGHT_COOLDOWN_SECONDS", 0.3)
-        elapsed = now - self._last_transition_time
+        threshold = self._threshold
+        drop_thresh = self._drop_thresh
+        hyst = self._hyst
 
         # 히스테리시스 적용
         if self.state == "HIGHLIGHT":
@@ -97,10 +119,6 @@ class HighlightDetector:
         else:
             threshold_go = threshold  # IDLE 상태
 
-        # 쿨다운 체크
-        if elapsed < cooldown:
-            return self.state
-
         # 상태 전이
         if self.state == "IDLE":
             if score >= threshold:
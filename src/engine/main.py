@@ -11,10 +11,14 @@
 from __future__ import annotations
 
 from typing import Any
+import functools
+import queue
+import threading
 import time
 import logging
 
 import numpy as np
+from scipy.fft import rfft
 
 from config import settings
 from src.engine.audio_in import load_audio
@@ -25,32 +29,17 @@ from src.engine.highlight import HighlightDetector
 from src.engine.outputs.udp_pixel_sender import UDPPixelSender
 
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
-
-def _adjust_payload_intensity(pixel_data: bytes, intensity: float) -> bytes:
-    """픽셀 데이터의 밝기(intensity)를 조정한다.
-
-    Args:
-        pixel_data: RGB 바이트 시퀀스
-        intensity: 0..1 범위 강도 배수
-
-    Returns:
-        조정된 픽셀 데이터
-    """
-    intensity = max(0.0, min(1.0, intensity))
-    if intensity == 1.0:
-        return pixel_data
-
-    arr = bytearray(pixel_data)
-    for i in range(0, len(arr), 3):
-        r = int(arr[i] * intensity) & 0xFF
-        g = int(arr[i + 1] * intensity) & 0xFF
-        b = int(arr[i + 2] * intensity) & 0xFF
-        arr[i] = r
-        arr[i + 1] = g
-        arr[i + 2] = b
-    return bytes(arr)
+# (모드, 하이라이트 상태) -> (출력 채널, 강도)
+# IDLE: ch3 0.3 / SPEECH: ch1 0.7 / MUSIC: ch0, HIGHLIGHT 1.0 / DROP 0.3 / 그 외(일반 음악) 0.7
+_STATE_MAP = {
+    **{("IDLE", h): (3, 0.3) for h in HighlightDetector.STATES},
+    **{("SPEECH", h): (1, 0.7) for h in HighlightDetector.STATES},
+    ("MUSIC", "HIGHLIGHT"): (0, 1.0),
+    ("MUSIC", "DROP"): (0, 0.3),
+    ("MUSIC", "IDLE"): (0, 0.7),
+}
+_DEFAULT_OUTPUT = (0, 0.7)
 
 
 def run_analysis(audio_path: str) -> None:
@@ -77,97 +66,139 @@ def run_analysis(audio_path: str) -> None:
     }
 
     feats = extract_features(x, sr, cfg)
-    times = feats.get("times", np.array([]))
-    rms = feats.get("rms", np.array([]))
-    flux = feats.get("flux", np.array([]))
+    # extract_features는 모든 프레임 배열을 같은 길이로 맞춰 반환한다.
+    # 프레임마다 numpy 스칼라를 float로 바꾸지 않도록 열 단위로 한 번에 리스트로 꺼낸다.
+    times = feats["times"].tolist()
+    columns = [feats[k].tolist() for k in ("rms", "band_low", "band_mid", "band_high", "flux")]
 
     mm = ModeManager(cfg)
     detector = HighlightDetector(cfg)
 
     sender = UDPPixelSender()
 
-    # 프레임별로 모드 업데이트 및 하이라이트 검출, 시뮬레이터 호출
-    for i, t in enumerate(times):
-        feat = {
-            "rms": float(rms[i]) if i < len(rms) else 0.0,
-            "band_low": float(feats["band_low"][i]) if i < len(feats["band_low"]) else 0.0,
-            "band_mid": float(feats["band_mid"][i]) if i < len(feats["band_mid"]) else 0.0,
-            "band_high": float(feats["band_high"][i]) if i < len(feats["band_high"]) else 0.0,
-            "onset_density": float(feats.get("onset_density", 0.0)),
-            "flux": float(flux[i]) if i < len(flux) else 0.0,
-        }
-
-        mode = mm.update(feat, now=time.time())
-        hlight_state = mm.update_highlight(feat, detector, now=time.time())
-
-        # 시뮬레이터에 mode를 반영 (간단하게 pixel 패턴 전송)
-        # 실제 네트워크 전송은 disabled (dry_run=True)
-        pixel_count = 64
-        if mode == "IDLE":
-            ch = 3
-            intensity = 0.3
-        elif mode == "SPEECH":
-            ch = 1
-            intensity = 0.7
-        else:  # MUSIC
-            ch = 0
-            # 하이라이트 상태에 따라 강도 조정
-            if hlight_state == "HIGHLIGHT":
-                intensity = 1.0
-            elif hlight_state == "DROP":
-                intensity = 0.3
-            else:  # IDLE (normal music)
-                intensity = 0.7
-
-        payload = UDPPixelSender.generate_dummy_pixel_data(pixel_count, ch)
-        # 강도 적용
-        payload = _adjust_payload_intensity(payload, intensity)
-        sender.send_frame("127.0.0.1", 9000 + ch, payload, output_id=ch + 1, frame_index=i, dry_run=True)
+    # 채널별 더미 페이로드는 프레임마다 같으므로 한 번만 만들어 둔다
+    pixel_count = 64
+    dummy_payloads = [
+        np.frombuffer(UDPPixelSender.generate_dummy_pixel_data(pixel_count, c), dtype=np.uint8)
+        for c in range(4)
+    ]
+
+    # 1) 상태 머신은 순차적이므로 프레임 루프로 모드/하이라이트 상태를 갱신하고
+    #    (채널, 강도)만 기록한다. 시간은 프레임 타임스탬프(오디오 타임라인)를 사용한다.
+    feat = {"onset_density": float(feats.get("onset_density", 0.0))}
+    outputs = []
+    for t, rms, low, mid, high, flux in zip(times, *columns):
+        feat["rms"] = rms
+        feat["band_low"] = low
+        feat["band_mid"] = mid
+        feat["band_high"] = high
+        feat["flux"] = flux
+        mode = mm.update(feat, now=t)
+        hlight_state = mm.update_highlight(feat, detector, now=t)
+        outputs.append(_STATE_MAP.get((mode, hlight_state), _DEFAULT_OUTPUT))
+
+    # 2) 페이로드 생성은 전체 프레임에 대해 벡터화한다.
+    outputs = np.array(outputs, dtype=np.float64).reshape(-1, 2)
+    channels = outputs[:, 0].astype(np.intp)
+    intensities = outputs[:, 1]
+    # UDPPixelSender.adjust_intensity와 같은 Q0.8 고정소수점 스케일 (강도 1.0이면 256 -> 원본 그대로)
+    scales = np.round(intensities * 256).astype(np.uint16)
+    payloads = ((np.stack(dummy_payloads)[channels].astype(np.uint16) * scales[:, None]) >> 8).astype(np.uint8)
+
+    # 3) 시뮬레이터에 mode를 반영 (간단하게 pixel 패턴 전송)
+    # 실제 네트워크 전송은 disabled (dry_run=True)
+    for i, ch in enumerate(channels.tolist()):
+        sender.send_frame("127.0.0.1", 9000 + ch, payloads[i].tobytes(), output_id=ch + 1, frame_index=i, dry_run=True)
 
     sender.close()
 
 
-def _frame_features_from_buffer(frame: np.ndarray, sr: int, prev_mag: np.ndarray | None = None):
+@functools.lru_cache(maxsize=4)
+def _bin_edges(n: int, sr: int) -> tuple[int, int, int]:
+    """길이 n 프레임의 rfft 빈 기준 밴드 경계 (20 / 300 / 2000 Hz) 인덱스
+
+    low: [lo:mid), mid: [mid:hi), high: [hi:]
+    """
+    freqs = np.fft.rfftfreq(n, d=1.0 / sr)
+    return tuple(int(i) for i in np.searchsorted(freqs, [20, 300, 2000]))
+
+
+@functools.lru_cache(maxsize=2)
+def _hann(n: int) -> np.ndarray:
+    """길이 n Hann 윈도우 (float32, 읽기 전용으로 캐시해 프레임마다 재사용)"""
+    win = np.hanning(n).astype(np.float32)
+    win.flags.writeable = False
+    return win
+
+
+def _frame_features_from_buffer(
+    frame: np.ndarray, sr: int, prev_mag: np.ndarray | None = None, state: dict | None = None
+):
     """간단한 프레임 기반 특징 계산 (실시간 목표, 가벼운 연산).
 
     반환: (feat_dict, curr_mag)
     feat keys: rms, band_low, band_mid, band_high, flux
+
+    `curr_mag`는 진폭 스펙트럼(|X|)이다 (daemon과 같은 단위). 모드/하이라이트 임계값이
+    진폭 기준으로 맞춰져 있으므로 파워(|X|^2)로 바꾸면 안 된다.
+
+    `state`: 프레임 간에 재사용할 작업 버퍼를 담는 dict (실시간 루프가 하나를 유지).
+    주면 flux 차이 배열을 여기 할당해 두고 매 프레임 제자리 연산으로 재사용한다.
     """
-    # RMS
-    rms = float(np.sqrt(np.mean(frame.astype(np.float64) ** 2))) if frame.size > 0 else 0.0
+    # float32로 한 번만 맞춘다 (실시간 루프의 프레임 버퍼는 이미 float32라 복사 없음)
+    frame = frame.astype(np.float32, copy=False)
+
+    # RMS: float64 업캐스트/제곱 임시 배열 없이 float32 내적 한 번 (daemon과 동일)
+    rms = float(np.sqrt(np.dot(frame, frame) / frame.size)) if frame.size > 0 else 0.0
 
     # FFT 기반 대역 에너지 비율
     n = len(frame)
     if n <= 0:
         return ({"rms": rms, "band_low": 0.0, "band_mid": 0.0, "band_high": 0.0, "flux": 0.0}, None)
 
-    # 윈도잉
-    win = np.hanning(n)
-    spec = np.fft.rfft(frame * win)
+    # 윈도잉 (float32 프레임 x float32 윈도우)
+    win = _hann(n)
+    # scipy.fft(pocketfft)는 길이별 plan을 캐시한다. 곱셈 결과는 임시 배열이므로 덮어써도 된다
+    spec = rfft(frame * win, n=n, overwrite_x=True)
     mag = np.abs(spec)
-    freqs = np.fft.rfftfreq(n, d=1.0 / sr)
 
+    # 마스크 대신 캐시된 빈 경계로 연속 슬라이스 합산 (빈 슬라이스의 합은 0)
+    lo, mid, hi = _bin_edges(n, sr)
     total = mag.sum() + 1e-12
-    low_idx = (freqs >= 20) & (freqs < 300)
-    mid_idx = (freqs >= 300) & (freqs < 2000)
-    high_idx = freqs >= 2000
-
-    low_e = float(mag[low_idx].sum() / total) if low_idx.any() else 0.0
-    mid_e = float(mag[mid_idx].sum() / total) if mid_idx.any() else 0.0
-    high_e = float(mag[high_idx].sum() / total) if high_idx.any() else 0.0
+    low_e = float(mag[lo:mid].sum() / total)
+    mid_e = float(mag[mid:hi].sum() / total)
+    high_e = float(mag[hi:].sum() / total)
 
     # spectral flux (양의 변화 합)
     if prev_mag is None or prev_mag.shape != mag.shape:
         flux = 0.0
     else:
-        diff = mag - prev_mag
-        pos = diff.clip(min=0.0)
-        flux = float(pos.sum() / (prev_mag.sum() + 1e-12))
+        diff = state.get("flux_buf") if state is not None else None
+        if diff is None or diff.shape != mag.shape or diff.dtype != mag.dtype:
+            diff = np.empty_like(mag)
+            if state is not None:
+                state["flux_buf"] = diff
+        np.subtract(mag, prev_mag, out=diff)
+        np.maximum(diff, 0.0, out=diff)
+        flux = float(diff.sum()) / (float(prev_mag.sum()) + 1e-12)
 
     feat = {"rms": rms, "band_low": low_e, "band_mid": mid_e, "band_high": high_e, "flux": flux}
     return feat, mag
 
 
+def _sender_worker(q: queue.Queue, sender: UDPPixelSender) -> None:
+    """송출 스레드: 큐에서 꺼낸 프레임을 송신한다 (None을 받으면 종료)."""
+    while True:
+        item = q.get()
+        if item is None:
+            break
+        host, port, payload, output_id, frame_index = item
+        try:
+            sender.send_frame(host, port, payload, output_id=output_id, frame_index=frame_index, dry_run=True)
+        except Exception as e:
+            logger.warning("프레임 송출 실패: %s", e)
+
+
 def run_realtime(x: np.ndarray | None = None, sr: int | None = None, audio_path: str | None = None, target_fps: int | None = None, max_seconds: float | None = None) -> int:
     """실시간 루프: audio -> features -> mode -> highlight -> simulator
 
@@ -185,6 +216,8 @@ def run_realtime(x: np.ndarray | None = None, sr: int | None = None, audio_path:
 
     if x is None or sr is None:
         raise ValueError("오디오 입력(x,sr) 또는 audio_path 중 하나는 필요합니다.")
+    # 파이프라인 전체를 float32로 유지한다 (load_audio 출력은 이미 float32라 복사 없음)
+    x = np.asarray(x, dtype=np.float32)
 
     fps = int(target_fps or settings.TARGET_FPS)
     samples_per_frame = int(settings.SAMPLES_PER_FRAME or max(1, int(sr / fps)))
@@ -208,16 +241,34 @@ def run_realtime(x: np.ndarray | None = None, sr: int | None = None, audio_path:
     })
 
     sender = UDPPixelSender()
+    # 송출(소켓/로그)은 별도 스레드에서 처리해 DSP 루프가 I/O를 기다리지 않게 한다
+    send_queue: queue.Queue = queue.Queue(maxsize=4)
+    send_thread = threading.Thread(target=_sender_worker, args=(send_queue, sender), name="realtime-sender", daemon=True)
+    send_thread.start()
+    dropped = 0
+
+    # 채널별 더미 페이로드는 프레임마다 같으므로 한 번만 만들어 둔다
+    pixel_count = 64
+    dummy_payloads = [
+        np.frombuffer(UDPPixelSender.generate_dummy_pixel_data(pixel_count, c), dtype=np.uint8)
+        for c in range(4)
+    ]
 
     n_samples = len(x)
     read_pos = 0
     frame_duration = 1.0 / fps
     prev_mag = None
+    feat_state: dict = {}
     frames = 0
-    start_time = time.time()
+    # 프레임 버퍼를 한 번만 할당해 재사용한다 (프레임마다 슬라이스 복사/concatenate 없음)
+    frame_buf = np.zeros(samples_per_frame, dtype=np.float32)
+    # 루프 안에서 매 프레임 모듈/함수 속성을 찾지 않도록 지역 변수로 바인딩
+    get_config_mtime = config_manager.get_config_mtime
+    last_cfg_mtime = getattr(run_realtime, "_last_cfg_mtime", None)
+    start_time = time.perf_counter()
 
     while True:
-        loop_start = time.time()
+        loop_start = time.perf_counter()
 
         # 종료 조건: 최대 시간
         if max_seconds is not None and (loop_start - start_time) >= max_seconds:
@@ -225,49 +276,44 @@ def run_realtime(x: np.ndarray | None = None, sr: int | None = None, audio_path:
 
         # 오디오 읽기
         end = min(read_pos + samples_per_frame, n_samples)
-        frame = x[read_pos:end]
-        # 제로패딩
-        if frame.size < samples_per_frame:
-            pad = np.zeros(samples_per_frame - frame.size, dtype=frame.dtype)
-            frame = np.concatenate((frame, pad))
+        n_read = end - read_pos
+        frame_buf[:n_read] = x[read_pos:end]
+        # 제로패딩 (마지막 짧은 프레임에서만)
+        if n_read < samples_per_frame:
+            frame_buf[n_read:] = 0.0
 
-        feat, mag = _frame_features_from_buffer(frame, sr, prev_mag)
+        feat, mag = _frame_features_from_buffer(frame_buf, sr, prev_mag, state=feat_state)
         prev_mag = mag
 
         # 모드/하이라이트 업데이트
-        now = time.time()
+        # 재생 위치 기반 시뮬레이션 시간 (벽시계 지터가 모드 판정에 섞이지 않음)
+        now = start_time + frames * frame_duration
         # 구성 파일 변경 감지: 변경되면 mm/detector 재초기화(간단 반영)
-        cfg_mtime = config_manager.get_config_mtime()
-        if cfg_mtime is not None and getattr(run_realtime, "_last_cfg_mtime", None) != cfg_mtime:
+        cfg_mtime = get_config_mtime()
+        if cfg_mtime is not None and last_cfg_mtime != cfg_mtime:
             # 재로드
             run_cfg = config_manager.load_config()
             # 필요한 설정이 있는 경우 ModeManager/HighlightDetector 파라미터에 반영
             # (간단히 로그로 표시; 향후 더 상세한 매핑 가능)
-            run_realtime._last_cfg_mtime = cfg_mtime
+            run_realtime._last_cfg_mtime = last_cfg_mtime = cfg_mtime
 
         mode = mm.update(feat, now=now)
         hstate = mm.update_highlight(feat, detector, now=now)
 
         # 시뮬레이터 반영 (강도 조정)
-        pixel_count = 64
-        if mode == "IDLE":
-            ch = 3
-            intensity = 0.3
-        elif mode == "SPEECH":
-            ch = 1
-            intensity = 0.7
-        else:
-            ch = 0
-            if hstate == "HIGHLIGHT":
-                intensity = 1.0
-            elif hstate == "DROP":
-                intensity = 0.3
-            else:
-                intensity = 0.7
-
-        payload = UDPPixelSender.generate_dummy_pixel_data(pixel_count, ch)
-        payload = _adjust_payload_intensity(payload, intensity)
-        sender.send_frame("127.0.0.1", 9000 + ch, payload, output_id=ch + 1, frame_index=frames, dry_run=True)
+        ch, intensity = _STATE_MAP.get((mode, hstate), _DEFAULT_OUTPUT)
+        payload = UDPPixelSender.adjust_intensity(dummy_payloads[ch], intensity)
+        item = ("127.0.0.1", 9000 + ch, payload, ch + 1, frames)
+        try:
+            send_queue.put_nowait(item)
+        except queue.Full:
+            # 송출이 밀리면 가장 오래된 프레임을 버리고 최신 프레임을 넣는다
+            try:
+                send_queue.get_nowait()
+                dropped += 1
+            except queue.Empty:
+                pass
+            send_queue.put_nowait(item)
 
         frames += 1
         read_pos = end
@@ -276,18 +322,26 @@ def run_realtime(x: np.ndarray | None = None, sr: int | None = None, audio_path:
             break
 
         # 루프 타이밍 보정
-        elapsed = time.time() - loop_start
+        elapsed = time.perf_counter() - loop_start
         sleep_for = frame_duration - elapsed
         if sleep_for > 0:
             time.sleep(sleep_for)
 
+    # 남은 프레임을 모두 송출한 뒤 송출 스레드 종료
+    send_queue.put(None)
+    send_thread.join()
     sender.close()
+    if dropped:
+        logger.info("송출 큐 드롭: %d 프레임", dropped)
     return frames
 
 
 if __name__ == "__main__":
     import sys
 
+    # 로깅 설정은 실행 진입점에서만 한다 (모듈 import 시 전역 로깅을 바꾸지 않음)
+    logging.basicConfig(level=logging.INFO)
+
     if len(sys.argv) < 2:
         print("Usage: python -m src.engine.main path/to/file.wav")
     else:
@@ -7,7 +7,7 @@
 from __future__ import annotations
 
 import time
-from typing import Dict, Any
+from typing import Dict, Any, Tuple
 
 
 class ModeManager:
@@ -20,46 +20,69 @@ class ModeManager:
     MODES = ("IDLE", "SPEECH", "MUSIC")
 
     def __init__(self, settings: Dict[str, Any]):
-        self.settings = settings
         self.current_mode = "IDLE"
         self._candidate = None
         self._candidate_since = None
         self.highlight_state = "IDLE"  # IDLE, HIGHLIGHT, DROP (A안)
+        self.reload(settings)
 
-    def _score_modes(self, feat: Dict[str, float]) -> Dict[str, float]:
+    def reload(self, settings: Dict[str, Any]) -> None:
+        """설정을 교체하고 임계값 스냅샷을 갱신한다 (모드/후보 상태는 유지).
+
+        프레임마다 dict에서 읽지 않도록 임계값을 float 속성으로 꺼내 둔다.
+        """
+        self.settings = settings
+        self._rms_silence = float(settings.get("RMS_SILENCE_THRESHOLD", 1e-5))
+        self._speech_mid_prop = float(settings.get("SPEECH_MID_PROP", 0.45))
+        self._music_onset_density = float(settings.get("MUSIC_ONSET_DENSITY", 0.08))
+        self._music_high_prop = float(settings.get("MUSIC_HIGH_PROP", 0.30))
+        self._hold = float(settings.get("MODE_HOLD_SECONDS", 0.6))
+
+    def _mode_scores(self, feat: Dict[str, float]) -> Tuple[float, float, float]:
+        """(IDLE, SPEECH, MUSIC) 점수를 스칼라 튜플로 계산한다 (프레임당 dict 생성 없음)."""
         # 간단 점수 규칙
-        low = float(feat.get("band_low", 0.0))
         mid = float(feat.get("band_mid", 0.0))
         high = float(feat.get("band_high", 0.0))
         rms = float(feat.get("rms", 0.0))
         onset = float(feat.get("onset_density", 0.0))
 
-        scores = {m: 0.0 for m in self.MODES}
+        mid_prop = self._speech_mid_prop
+        onset_density = self._music_onset_density
+
+        idle = speech = music = 0.0
 
         # IDLE: RMS가 매우 낮으면 우선
-        if rms < self.settings.get("RMS_SILENCE_THRESHOLD", 1e-5):
-            scores["IDLE"] += 1.0
+        if rms < self._rms_silence:
+            idle += 1.0
 
         # SPEECH: mid 비율이 크고 onset이 낮은 편
-        if mid > self.settings.get("SPEECH_MID_PROP", 0.45) and onset < self.settings.get("MUSIC_ONSET_DENSITY", 0.08):
-            scores["SPEECH"] += 1.0 + (mid - self.settings.get("SPEECH_MID_PROP", 0.45))
+        if mid > mid_prop and onset < onset_density:
+            speech += 1.0 + (mid - mid_prop)
 
         # MUSIC: onset density 높고 high 비율도 어느정도
-        if onset > self.settings.get("MUSIC_ONSET_DENSITY", 0.08) and high > self.settings.get("MUSIC_HIGH_PROP", 0.30):
-            scores["MUSIC"] += 1.0 + (onset - self.settings.get("MUSIC_ONSET_DENSITY", 0.08))
+        if onset > onset_density and high > self._music_high_prop:
+            music += 1.0 + (onset - onset_density)
 
         # 보조: high가 매우 큰 경우 MUSIC 가중
         if high > 0.5:
-            scores["MUSIC"] += 0.5
+            music += 0.5
 
-        return scores
+        return idle, speech, music
+
+    def _score_modes(self, feat: Dict[str, float]) -> Dict[str, float]:
+        return dict(zip(self.MODES, self._mode_scores(feat)))
 
     def update(self, feat: Dict[str, float], now: float | None = None) -> str:
         """현재 프레임의 특징을 받아 모드를 업데이트하고 반환한다."""
         now = now if now is not None else time.time()
-        scores = self._score_modes(feat)
-        # 가장 높은 점수 모드 선택
-        candidate = max(scores.items(), key=lambda x: x[1])[0]
+        idle, speech, music = self._mode_scores(feat)
+        # 가장 높은 점수 모드 선택 (동점이면 MODES 순서상 앞선 모드, max()와 동일)
+        if idle >= speech and idle >= music:
+            candidate = "IDLE"
+        elif speech >= music:
+            candidate = "SPEECH"
+        else:
+            candidate = "MUSIC"
 
         # 후보가 바뀌었으면 타이머 리셋
         if candidate != self._candidate:
@@ -70,9 +93,9 @@ class ModeManager:
         if candidate == self.current_mode:
             return self.current_mode
 
-        # 후보가 일정 시간 유지되면 전환
-        hold = float(self.settings.get("MODE_HOLD_SECONDS", 0.6))
-        if (now - (self._candidate_since or now)) >= hold and candidate != self.current_mode:
+        # 후보가 일정 시간 유지되면 전환 (now=0.0에서 시작하는 오디오 타임라인도 있으므로 None으로만 판단)
+        since = now if self._candidate_since is None else self._candidate_since
+        if (now - since) >= self._hold and candidate != self.current_mode:
             self.current_mode = candidate
             return self.current_mode
 
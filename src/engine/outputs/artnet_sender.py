@@ -12,13 +12,15 @@ Art-Net DMX 송신기 (스켈레톤)
 
 from __future__ import annotations
 
+import functools
 import socket
 import struct
 import logging
 from typing import ByteString
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 ARTNET_PORT = 6454
 
@@ -108,15 +110,17 @@ class ArtNetSender:
             self.sock.sendto(packet, (host, port))
 
     @staticmethod
+    @functools.lru_cache(maxsize=1)
     def generate_dummy_dmx() -> bytes:
-        """간단한 더미 DMX 패턴 생성: 채널별로 그라데이션을 채움("""
-        data = bytearray(512)
-        for i in range(512):
-            data[i] = (i * 3) & 0xFF
-        return bytes(data)
+        """간단한 더미 DMX 패턴 생성: 채널별로 그라데이션을 채움
+
+        패턴은 항상 같으므로 한 번만 만들어 캐시한다 (불변 bytes 반환).
+        """
+        return ((np.arange(512, dtype=np.uint16) * 3) & 0xFF).astype(np.uint8).tobytes()
 
 
 if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
     sender = ArtNetSender()
     dmx = ArtNetSender.generate_dummy_dmx()
     # dry run으로 로그에서 전송 내용 확인
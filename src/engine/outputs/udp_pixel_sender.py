@@ -17,8 +17,9 @@ from importlib import import_module
 from typing import Optional
 from typing import Tuple
 
+import numpy as np
+
 logger = logging.getLogger(__name__)
-logging.basicConfig(level=logging.INFO)
 
 # 헤더 포맷 (네트워크 바이트 순서: big-endian)
 # output_id: uint16, pixel_count: uint16, frame_index: uint32, chunk_index: uint16, total_chunks: uint16
@@ -42,6 +43,10 @@ class UDPPixelSender:
     def __init__(self, mtu: int = DEFAULT_MTU) -> None:
         self.mtu = mtu
         self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # 청크마다 헤더를 새로 만들지 않도록 pack_into로 덮어쓸 헤더 버퍼
+        self._hdr_buf = bytearray(_HEADER_SIZE)
+        # sendmsg(scatter-gather)가 없는 플랫폼(Windows)은 header+chunk 결합 후 sendto
+        self._has_sendmsg = hasattr(self.sock, "sendmsg")
 
     def close(self) -> None:
         self.sock.close()
@@ -83,22 +88,51 @@ class UDPPixelSender:
 
         max_payload_per_packet, total_chunks, _ = self._chunk_payload(pixel_payload)
 
-        logger.info("전송 시작: %s:%d output_id=%d pixel_count=%d frame_index=%d total_chunks=%d mtu=%d",
+        # 프레임/청크 단위 로그는 실시간 경로에서 매 프레임 호출되므로 DEBUG로 둔다
+        logger.debug("전송 시작: %s:%d output_id=%d pixel_count=%d frame_index=%d total_chunks=%d mtu=%d",
                     host, port, output_id, pixel_count, frame_index, total_chunks, self.mtu)
 
+        # 페이로드는 memoryview 슬라이스로 잘라 청크별 복사를 피한다
+        pv = memoryview(pixel_payload).cast("B")
+        hdr = self._hdr_buf
+        addr = (host, int(port))
         offset = 0
         for chunk_index in range(total_chunks):
-            chunk = pixel_payload[offset: offset + max_payload_per_packet]
-            header = struct.pack(_HEADER_FMT, int(output_id) & 0xFFFF, int(pixel_count) & 0xFFFF, int(frame_index) & 0xFFFFFFFF, int(chunk_index) & 0xFFFF, int(total_chunks) & 0xFFFF)
-            packet = header + chunk
+            chunk = pv[offset: offset + max_payload_per_packet]
+            struct.pack_into(_HEADER_FMT, hdr, 0, int(output_id) & 0xFFFF, int(pixel_count) & 0xFFFF, int(frame_index) & 0xFFFFFFFF, int(chunk_index) & 0xFFFF, int(total_chunks) & 0xFFFF)
 
             if dry_run:
-                logger.info("[DRY] 송신 패킷: output=%d frame=%d chunk=%d/%d bytes=%d", output_id, frame_index, chunk_index + 1, total_chunks, len(packet))
+                logger.debug("[DRY] 송신 패킷: output=%d frame=%d chunk=%d/%d bytes=%d", output_id, frame_index, chunk_index + 1, total_chunks, _HEADER_SIZE + len(chunk))
+            elif self._has_sendmsg:
+                # 헤더와 페이로드 조각을 결합하지 않고 한 데이터그램으로 전송
+                self.sock.sendmsg([hdr, chunk], [], 0, addr)
             else:
-                self.sock.sendto(packet, (host, int(port)))
+                self.sock.sendto(bytes(hdr) + chunk, addr)
 
             offset += len(chunk)
 
+    @staticmethod
+    def adjust_intensity(pixel_data: bytes | np.ndarray, intensity: float) -> bytes:
+        """픽셀 데이터의 밝기(intensity)를 조정한다 (엔진의 모든 송출 경로가 공유).
+
+        강도를 Q0.8 고정소수점(round(intensity*256))으로 바꿔 uint16 곱셈 + >>8 한 번으로
+        전체 바이트에 적용한다 (픽셀당 파이썬 연산 없음, 부동소수 변환 없음).
+
+        Args:
+            pixel_data: RGB 바이트 시퀀스 (또는 uint8 배열)
+            intensity: 0..1 범위 강도 배수
+
+        Returns:
+            조정된 픽셀 데이터
+        """
+        intensity = max(0.0, min(1.0, intensity))
+        if intensity == 1.0:
+            return pixel_data if isinstance(pixel_data, bytes) else bytes(pixel_data)
+
+        a = np.frombuffer(pixel_data, dtype=np.uint8)
+        scale = np.uint16(round(intensity * 256))
+        return ((a.astype(np.uint16) * scale) >> 8).astype(np.uint8).tobytes()
+
     @staticmethod
     def generate_dummy_pixel_data(pixel_count: int, channel_index: int = 0) -> bytes:
         """더미 패턴 생성: 각 채널별로 서로 다른 색상 패턴을 생성한다.
@@ -108,25 +142,23 @@ class UDPPixelSender:
         - 채널 인덱스 1: 그린 그라데이션
         - 채널 인덱스 2: 블루 그라데이션
         - 채널 인덱스 3: 화이트/펄스
+
+        그라데이션 값 t는 정수 산술 i*255 // (n-1)로 한 번에 만든다
+        (int(i/(n-1)*255)와 동일한 값).
         """
-        data = bytearray()
-        for i in range(pixel_count):
-            t = int((i / max(1, pixel_count - 1)) * 255)
-            if channel_index == 0:
-                r, g, b = t, 0, 0
-            elif channel_index == 1:
-                r, g, b = 0, t, 0
-            elif channel_index == 2:
-                r, g, b = 0, 0, t
-            else:
-                # 채널 3 : 색상 섞기
-                r, g, b = t, 255 - t, (t * 2) & 255
-            data.extend([r & 0xFF, g & 0xFF, b & 0xFF])
-        return bytes(data)
+        t = ((np.arange(pixel_count, dtype=np.uint32) * 255) // max(1, pixel_count - 1)).astype(np.uint8)
+        if channel_index in (0, 1, 2):
+            out = np.zeros((pixel_count, 3), dtype=np.uint8)
+            out[:, channel_index] = t
+        else:
+            # 채널 3 : 색상 섞기
+            out = np.stack([t, 255 - t, (t.astype(np.uint16) * 2).astype(np.uint8)], axis=1)
+        return out.tobytes()
 
 
 if __name__ == "__main__":
     # 간단한 시뮬레이션: 4채널 각각 localhost의 서로 다른 포트로 더미 데이터 전송 (dry_run=True -> 로그 확인)
+    logging.basicConfig(level=logging.DEBUG)
     sender = UDPPixelSender(mtu=1200)
     pixel_count = 64
     for ch in range(4):
@@ -10,6 +10,8 @@ from __future__ import annotations
 
 from typing import ByteString
 
+import numpy as np
+
 
 class DMXSimulator:
     """콘솔 기반 DMX 시뮬레이터"""
@@ -22,19 +24,22 @@ class DMXSimulator:
         length = min(len(dmx_data), self.channels)
         print(f"[DMX_SIM] universe={universe} channels={length}")
 
-        # 주요 통계
-        nonzero = sum(1 for v in dmx_data[:length] if v)
-        mx = max(dmx_data[:length]) if length > 0 else 0
-        mn = min(dmx_data[:length]) if length > 0 else 0
+        # 주요 통계 (복사 없는 uint8 뷰에서 NumPy 리덕션으로 계산)
+        arr = np.frombuffer(dmx_data, dtype=np.uint8, count=length)
+        nonzero = int(np.count_nonzero(arr))
+        mx = int(arr.max()) if length > 0 else 0
+        mn = int(arr.min()) if length > 0 else 0
         print(f"  nonzero={nonzero} min={mn} max={mx}")
 
-        # 첫 48 채널을 12열로 표 형태 출력
+        # 첫 48 채널을 12열로 표 형태 출력 (한 번의 enumerate로 셀을 만들고 행 단위로 묶음)
         to_display = min(length, 48)
         cols = 12
-        for r in range(0, to_display, cols):
-            row = dmx_data[r : r + cols]
-            nums = [f"{(r + i + 1):03d}:{val:03d}" for i, val in enumerate(row)]
-            print("  " + " ".join(nums))
+        # 마지막 행은 기존처럼 12열을 채워 표시 (데이터 길이까지)
+        shown = min(len(dmx_data), -(-to_display // cols) * cols)
+        row_vals = np.frombuffer(dmx_data, dtype=np.uint8, count=shown).tolist()
+        cells = [f"{(i + 1):03d}:{val:03d}" for i, val in enumerate(row_vals)]
+        for r in range(0, len(cells), cols):
+            print("  " + " ".join(cells[r : r + cols]))
 
         print("\n")
 
@@ -12,6 +12,12 @@ from __future__ import annotations
 import math
 from typing import ByteString
 
+import numpy as np
+
+# 밝기 10단계 문자 (어두움 -> 밝음)
+_LEVELS = " .:-=+*#%@"
+_LEVEL_CHARS = np.array(list(_LEVELS))
+
 
 class PixelSimulator:
     """콘솔 기반 픽셀 시뮬레이터"""
@@ -22,9 +28,8 @@ class PixelSimulator:
     def _luminance_char(self, r: int, g: int, b: int) -> str:
         """픽셀 밝기를 10단계 문자로 매핑"""
         lum = 0.2126 * r + 0.7152 * g + 0.0722 * b
-        levels = " .:-=+*#%@"
-        idx = int((lum / 255.0) * (len(levels) - 1))
-        return levels[idx]
+        idx = int((lum / 255.0) * (len(_LEVELS) - 1))
+        return _LEVELS[idx]
 
     def display_frame(self, output_id: int, pixel_payload: ByteString, frame_index: int = 0) -> None:
         """픽셀 프레임을 콘솔에 표시한다.
@@ -44,17 +49,16 @@ class PixelSimulator:
         print(f"[PIXEL_SIM] output={output_id} frame={frame_index} pixels={pixel_count}")
 
         # 축약해서 표시: 시작~끝 일부를 포함
+        # 표시할 픽셀만 strided 뷰로 골라 밝기 -> 문자 매핑을 한 번에 계산한다
+        # (_luminance_char와 같은 식/연산 순서라 결과 문자가 동일)
         step = max(1, pixel_count // display_width)
-        chars = []
-        for i in range(0, pixel_count, step):
-            idx = i * 3
-            r = pixel_payload[idx]
-            g = pixel_payload[idx + 1]
-            b = pixel_payload[idx + 2]
-            chars.append(self._luminance_char(r, g, b))
+        rgb = np.frombuffer(pixel_payload, dtype=np.uint8, count=pixel_count * 3).reshape(-1, 3)[::step]
+        rgb = rgb.astype(np.float64)
+        lum = 0.2126 * rgb[:, 0] + 0.7152 * rgb[:, 1] + 0.0722 * rgb[:, 2]
+        idx = ((lum / 255.0) * (len(_LEVELS) - 1)).astype(np.intp)
 
         # 출력
-        print("".join(chars))
+        print("".join(_LEVEL_CHARS[idx]))
         print("\n")
 
 
@@ -3,6 +3,7 @@
 
 - GET / : 간단한 HTML 폼(정적)
 - GET /api/config : 현재 설정 반환
+- GET /api/config/export : 현재 설정을 보기 좋은 JSON 파일로 다운로드
 - POST /api/config : 설정 저장(검증 포함)
 - GET /api/status : 엔진 상태(간단한 JSON)
 
@@ -16,7 +17,7 @@ import logging
 from typing import Any, Dict
 
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse, JSONResponse
+from fastapi.responses import HTMLResponse, JSONResponse, Response
 
 from src.web import config_manager
 
@@ -45,8 +46,20 @@ async def wizard_index():
 
 @app.get("/api/config")
 async def api_get_config():
+    # 저장된 JSON bytes를 그대로 응답한다 (파일이 그대로면 stat 한 번, 파싱/재직렬화 없음)
+    raw = config_manager.load_config_bytes()
+    return Response(content=raw if raw is not None else b"{}", media_type="application/json")
+
+
+@app.get("/api/config/export")
+async def api_export_config():
+    # 파일은 compact JSON으로 저장되므로 다운로드용으로만 들여쓰기해서 내보낸다
     cfg = config_manager.load_config()
-    return JSONResponse(content=cfg)
+    return Response(
+        content=config_manager.export_pretty(cfg),
+        media_type="application/json",
+        headers={"Content-Disposition": 'attachment; filename="install_config.json"'},
+    )
 
 
 @app.post("/api/config")
@@ -60,8 +73,11 @@ async def api_post_config(request: Request):
     if not ok:
         raise HTTPException(status_code=422, detail={"errors": errors})
 
-    # 저장
-    config_manager.save_config(body)
+    # 저장: 엔진 프로세스와 /api/status(config_mtime)가 바로 새 설정을 보도록 즉시 기록한다
+    try:
+        config_manager.save_config(body, immediate=True)
+    except OSError:
+        raise HTTPException(status_code=500, detail="설정 저장 실패")
     return JSONResponse(content={"ok": True})
 
 
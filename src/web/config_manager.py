@@ -8,88 +8,413 @@
 """
 from __future__ import annotations
 
+import atexit
+import hashlib
+import itertools
 import json
+import logging
 import os
-from typing import Any, Dict, List, Tuple
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# orjson(Rust 구현)이 있으면 파싱/직렬화에 사용하고, 없으면 표준 json으로 동작한다.
+# 둘 다 UTF-8 bytes를 주고받으므로 파일은 바이너리 모드로 읽고 쓴다.
+# 런타임 저장은 공백 없는 compact JSON (사람이 볼 용도는 export_pretty()).
+try:
+    import orjson
+
+    _loads = orjson.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+
+except ImportError:  # pragma: no cover - orjson 미설치 환경
+    _loads = json.loads
+
+    def _dumps(obj: Any) -> bytes:
+        return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+def export_pretty(cfg: Dict[str, Any]) -> str:
+    """사람이 읽기 좋은 들여쓰기 JSON 문자열 (UI 다운로드용)"""
+    return json.dumps(cfg, ensure_ascii=False, indent=2)
+
 
 CONFIG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(__file__))), "config", "install_config.json")
 
+# 마지막으로 읽은 설정 파일의 원본 bytes ((경로, mtime_ns, 크기) 기준으로 유효성 판단).
+# 파싱 결과 대신 bytes를 보관하고 요청마다 다시 파싱한다: 호출자마다 독립된 dict를
+# 돌려주면서도 deepcopy보다 싸다.
+_CACHE: Dict[str, Any] = {"key": None, "raw": None}
+
+# 지연 저장: 짧은 시간 안의 연속 저장을 한 번의 파일 쓰기로 묶는다
+SAVE_DEBOUNCE_SECONDS = 5.0
+_SAVE_LOCK = threading.Lock()
+# 파일 쓰기 직렬화용 (타이머/atexit/즉시 저장이 겹칠 때). _SAVE_LOCK은 쓰는 동안 잡지 않는다.
+_WRITE_LOCK = threading.Lock()
+# 보관 중인 저장분: 저장 시점에 직렬화한 payload와, 쓰는 도중 새 저장이 들어왔는지 구분할 순번
+_PENDING: Dict[str, Any] = {"path": None, "payload": None, "seq": 0}
+_save_timer: threading.Timer | None = None
+
+# 마지막으로 기록한 내용: 같은 내용을 다시 저장하면 파일 쓰기/fsync를 생략한다
+# (파일이 외부에서 바뀌었는지는 기록 직후의 (mtime_ns, size)로 확인)
+_LAST_WRITE: Dict[str, Any] = {"path": None, "digest": None, "stat": None}
+
 
 def load_config() -> Dict[str, Any]:
-    """설정 파일을 로드(존재하지 않으면 빈 dict 반환)"""
+    """설정 파일을 로드(존재하지 않으면 빈 dict 반환)
+
+    파일 mtime(ns)과 크기가 마지막 로드 때와 같으면 파일을 다시 열지 않고 캐시된
+    bytes를 파싱해 돌려준다. 매 호출 새 dict이므로 호출자가 수정해도 캐시는 영향받지
+    않는다. 캐시 확인은 stat 한 번으로 끝난다.
+    """
+    raw = load_config_bytes()
+    return _loads(raw) if raw is not None else {}
+
+
+def load_config_bytes() -> bytes | None:
+    """현재 설정의 JSON bytes (설정 파일이 없으면 None)
+
+    파싱이 필요 없는 호출자(예: 설정을 그대로 응답하는 웹 API)용.
+    """
+    # 아직 파일에 쓰지 않은 저장분이 있으면 그것이 최신 설정
+    path = CONFIG_PATH
+    with _SAVE_LOCK:
+        if _PENDING["path"] == path and _PENDING["payload"] is not None:
+            return _PENDING["payload"]
+
+    st = _stat(path)
+    if st is None:
+        return None
+    key = (path, st.st_mtime_ns, st.st_size)
+    if key == _CACHE["key"] and _CACHE["raw"] is not None:
+        return _CACHE["raw"]
+
     try:
-        with open(CONFIG_PATH, "r", encoding="utf-8") as f:
-            return json.load(f)
+        with open(path, "rb") as f:
+            raw = f.read()
     except FileNotFoundError:
-        return {}
+        return None
+    _CACHE["key"] = key
+    _CACHE["raw"] = raw
+    return raw
+
+
+def _stat(path: str) -> os.stat_result | None:
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+
+def save_config(cfg: Dict[str, Any], *, immediate: bool = False) -> None:
+    """설정 파일 저장 (디렉터리 생성 포함)
+
+    기본은 지연 저장이다: 설정을 메모리에 보관하고 첫 저장 요청 후
+    SAVE_DEBOUNCE_SECONDS 안에 들어온 저장을 모아 마지막 내용만 한 번 기록한다.
+    그 사이 load_config()는 보관 중인 최신 설정을 돌려주고, 프로세스 종료 시에도
+    atexit로 기록된다. 단 get_config_mtime()과 다른 프로세스(엔진)는 파일이 기록된
+    뒤에야 변경을 본다. 다른 프로세스에 바로 보여야 하는 저장(웹 API)은 immediate=True로
+    즉시 파일에 쓴다. 즉시 저장의 쓰기 오류는 호출자에게 예외로 전달된다.
+    """
+    global _save_timer
+    # 저장 시점의 내용으로 직렬화해 둔다 (이후 호출자가 cfg를 수정해도 영향 없음,
+    # 직렬화 불가능한 값은 타이머 스레드가 아니라 호출자에게 바로 예외로 알림)
+    payload = _dumps(cfg)
+    with _SAVE_LOCK:
+        _PENDING["path"] = CONFIG_PATH
+        _PENDING["payload"] = payload
+        _PENDING["seq"] += 1
+        if not immediate:
+            if _save_timer is None:
+                _save_timer = threading.Timer(SAVE_DEBOUNCE_SECONDS, _flush)
+                _save_timer.daemon = True
+                _save_timer.start()
+            return
+    _flush(raise_errors=True)
+
+
+def _flush(raise_errors: bool = False) -> None:
+    """보관 중인 저장분이 있으면 파일에 기록한다 (타이머/atexit/즉시 저장에서 호출).
+
+    payload만 _SAVE_LOCK 안에서 꺼내고 파일 쓰기/fsync는 락 밖에서 하므로 그동안
+    load_config() 호출자가 막히지 않는다. 저장분은 기록에 성공한 뒤에만 비우며,
+    실패하면 로그를 남기고 보관한 채 다시 시도하도록 타이머를 건다.
+    쓰기 오류는 raise_errors=True(즉시 저장)일 때만 다시 던진다: 타이머 스레드나
+    atexit에서 던지면 받을 호출자 없이 traceback만 한 번 더 찍힌다.
+    """
+    global _save_timer
+    with _WRITE_LOCK:
+        with _SAVE_LOCK:
+            if _save_timer is not None:
+                _save_timer.cancel()
+                _save_timer = None
+            path, payload, seq = _PENDING["path"], _PENDING["payload"], _PENDING["seq"]
+        if path is None:
+            return
+
+        digest = hashlib.blake2b(payload, digest_size=16).digest()
+        unchanged = (
+            _LAST_WRITE["path"] == path and _LAST_WRITE["digest"] == digest and _LAST_WRITE["stat"] == _file_stat(path)
+        )
+        if not unchanged:
+            try:
+                _write_atomic(path, payload)
+            except Exception:
+                logger.exception("설정 저장 실패 (저장분을 보관하고 재시도): %s", path)
+                with _SAVE_LOCK:
+                    if _save_timer is None:
+                        _save_timer = threading.Timer(SAVE_DEBOUNCE_SECONDS, _flush)
+                        _save_timer.daemon = True
+                        _save_timer.start()
+                if raise_errors:
+                    raise
+                return
+            _LAST_WRITE["path"] = path
+            _LAST_WRITE["digest"] = digest
+            _LAST_WRITE["stat"] = _file_stat(path)
+            # mtime 해상도가 낮은 파일시스템에서도 저장 직후 로드가 새 내용을 읽도록 무효화
+            _CACHE["key"] = None
+            _CACHE["raw"] = None
+
+        with _SAVE_LOCK:
+            # 쓰는 동안 새 저장이 들어왔으면 그 저장분은 남겨 둔다 (타이머가 기록)
+            if _PENDING["seq"] == seq:
+                _PENDING["path"] = None
+                _PENDING["payload"] = None
+
+
+def _file_stat(path: str) -> Tuple[int, int] | None:
+    st = _stat(path)
+    return None if st is None else (st.st_mtime_ns, st.st_size)
+
+
+def _write_atomic(path: str, payload: bytes) -> None:
+    """임시 파일에 기록+fsync한 뒤 os.replace로 교체한다.
+
+    교체는 원자적이므로 읽는 쪽은 이전 파일이나 새 파일 전체만 보게 된다
+    (기록 중 크래시가 나도 반쯤 쓰인 설정 파일이 남지 않음).
+    """
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = path + ".tmp"
+    try:
+        with open(tmp, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+
+
+atexit.register(_flush)
+
+
+# 흔한 channel_mode 문자열 -> 채널 수 (예외 처리 없이 dict 조회로 끝나는 경로)
+_MODE_CHANNELS = {str(i): i for i in (1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 12, 16, 24, 32)}
+
+
+def _mode_channels(mode: Any) -> int:
+    """channel_mode -> 채널 수 추정: mode '1' -> 1채널, '3' -> 3채널 등 (해석 불가면 1)"""
+    if isinstance(mode, str):
+        channels = _MODE_CHANNELS.get(mode)
+        if channels is not None:
+            return channels
+    # 드문 값(정수형, 공백/부호 포함 문자열, 잘못된 값)은 기존처럼 int()로 해석
+    try:
+        return int(mode)
+    except Exception:
+        return 1
 
 
-def save_config(cfg: Dict[str, Any]) -> None:
-    """설정 파일 저장 (디렉터리 생성 포함)"""
-    os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
-    with open(CONFIG_PATH, "w", encoding="utf-8") as f:
-        json.dump(cfg, f, ensure_ascii=False, indent=2)
+# 검증 오류 코드 -> 메시지 형식. 내부 검증기는 (코드, 인자...) 튜플만 만들고
+# 문자열은 호출자가 원할 때 format_error()로 만든다.
+ERROR_MESSAGES: Dict[str, str] = {
+    "STAGE_TYPE": "stage 정보가 잘못되었습니다",
+    "FIXTURES_TYPE": "dmx_fixtures 형식 오류",
+    "PIXELS_TYPE": "pixel_channels 형식 오류",
+    "DMX_START_RANGE": "DMX 시작주소 범위오류: {}",
+    "DMX_DUPLICATE": "DMX 주소 중복: {}",
+    "DMX_TOTAL": "총 DMX 채널 수 초과: {} > 512",
+    "PIXEL_COUNT_RANGE": "pixel_count 범위오류: output_id={} count={}",
+}
 
 
-def _validate_fixtures(fixtures: List[Dict[str, Any]]) -> List[str]:
-    errors: List[str] = []
-    used_addresses: List[int] = []
+def format_error(err: Tuple[Any, ...]) -> str:
+    """(코드, 인자...) 오류 튜플을 사용자 메시지로 변환한다."""
+    return ERROR_MESSAGES[err[0]].format(*err[1:])
+
+
+def _iter_errors(fixtures: List[Dict[str, Any]], pixels: List[Dict[str, Any]]) -> Iterator[Tuple[Any, ...]]:
+    """fixture -> pixel 순서로 한 번에 훑으며 오류를 (코드, 인자...) 튜플로 생성한다
+
+    두 검사를 하나의 제너레이터로 합쳐 검증 한 번에 제너레이터 하나만 만든다
+    (소비하는 만큼만 검사).
+    """
+    # 사용 중인 DMX 주소 비트맵: 비트 (a-1) = 주소 a (1..512)
+    used = 0
+    # 1 미만 주소 (시작주소 범위오류인 경우만 생김, 기존처럼 중복도 검사)
+    used_invalid: set = set()
     total_channels = 0
+    # 루프 안에서 전역/내장 이름 조회를 반복하지 않도록 지역 변수로 묶어 둔다
+    _int = int
+    _str = str
+    mode_get = _MODE_CHANNELS.get
+    mode_channels = _mode_channels
     for fx in fixtures:
-        start = int(fx.get("start_address", 0))
-        mode = fx.get("channel_mode", "1")
-        # 간단히 채널 수 추정: mode '1' -> 1채널, '3' -> 3채널 등
-        try:
-            channels = int(mode)
-        except Exception:
-            channels = 1
+        get = fx.get
+        start = _int(get("start_address", 0))
+        mode = get("channel_mode", "1")
+        # 흔한 channel_mode 문자열은 함수 호출 없이 표에서 바로 찾는다
+        channels = mode_get(mode) if mode.__class__ is _str else None
+        if channels is None:
+            channels = mode_channels(mode)
+
+        # 채널 주소 구간 [start, end)
+        end = start + channels
+        if end > 513:
+            end = 513
 
-        if start < 1 or start > 512:
-            errors.append(f"DMX 시작주소 범위오류: {start}")
+        if start < 1:
+            yield ("DMX_START_RANGE", start)
+            for a in range(start, end if end < 1 else 1):
+                if a in used_invalid:
+                    yield ("DMX_DUPLICATE", a)
+                else:
+                    used_invalid.add(a)
+            lo = 1
+        else:
+            if start > 512:
+                yield ("DMX_START_RANGE", start)
+            lo = start
 
-        # 채널 주소 배열
-        addresses = list(range(start, min(513, start + channels)))
-        for a in addresses:
-            if a in used_addresses:
-                errors.append(f"DMX 주소 중복: {a}")
-            else:
-                used_addresses.append(a)
+        # 유효 구간은 비트마스크 하나로 겹침 검사 후 등록 (주소별 리스트 탐색 없음)
+        if end > lo:
+            mask = ((1 << (end - lo)) - 1) << (lo - 1)
+            overlap = used & mask
+            # 겹친 비트만 낮은 주소부터 순회해 보고
+            while overlap:
+                low_bit = overlap & -overlap
+                yield ("DMX_DUPLICATE", low_bit.bit_length())
+                overlap ^= low_bit
+            used |= mask
 
         total_channels += channels
 
     if total_channels > 512:
-        errors.append(f"총 DMX 채널 수 초과: {total_channels} > 512")
+        yield ("DMX_TOTAL", total_channels)
 
-    return errors
-
-
-def _validate_pixels(pixels: List[Dict[str, Any]]) -> List[str]:
-    errors: List[str] = []
+    # pixel_count 범위 검사
     for p in pixels:
-        cnt = int(p.get("pixel_count", 0))
+        cnt = _int(p.get("pixel_count", 0))
         if cnt < 0 or cnt > 1024:
-            errors.append(f"pixel_count 범위오류: output_id={p.get('output_id')} count={cnt}")
-    return errors
+            yield ("PIXEL_COUNT_RANGE", p.get("output_id"), cnt)
+
+
+# validate_config 결과 LRU 캐시 (웹 UI가 같은 설정을 반복 검증할 때 재스캔 생략)
+_VALIDATE_CACHE: "OrderedDict[tuple, Tuple[bool, Tuple[Tuple[Any, ...], ...]]]" = OrderedDict()
+_VALIDATE_CACHE_SIZE = 64
 
 
-def validate_config(cfg: Dict[str, Any]) -> Tuple[bool, List[str]]:
-    """설정 딕셔너리의 기본 검증을 수행하고 (ok, errors)를 반환한다."""
-    errors: List[str] = []
+def _validate_key(cfg: Dict[str, Any]) -> tuple | None:
+    """검증 결과를 좌우하는 값만 모은 캐시 키 (만들 수 없으면 None)
+
+    stage는 dict 여부만 검사하므로 내용 대신 그 여부만 키에 넣는다.
+    1 / 1.0 / True처럼 같다고 비교되지만 메시지 형식이 달라지는 값이 섞이지 않도록
+    각 값은 (타입, 값) 쌍으로 넣는다.
+    """
+    fixtures = cfg.get("dmx_fixtures", []) or []
+    pixels = cfg.get("pixel_channels", []) or []
+    if not (isinstance(fixtures, list) and isinstance(pixels, list)):
+        return None
+    try:
+        key = (
+            isinstance(cfg.get("stage", {}), dict),
+            tuple(
+                (type(s), s, type(m), m)
+                for fx in fixtures
+                for s, m in ((fx.get("start_address", 0), fx.get("channel_mode", "1")),)
+            ),
+            tuple(
+                (type(o), o, type(c), c)
+                for p in pixels
+                for o, c in ((p.get("output_id"), p.get("pixel_count", 0)),)
+            ),
+        )
+        hash(key)
+    except (AttributeError, TypeError):
+        # dict가 아닌 항목이나 해시 불가능한 값: 캐시 없이 그대로 검증
+        return None
+    return key
+
+
+def validate_config(
+    cfg: Dict[str, Any], errors_limit: int | None = None, format_errors: bool = True
+) -> Tuple[bool, List[Any]]:
+    """설정 딕셔너리의 기본 검증을 수행하고 (ok, errors)를 반환한다.
+
+    같은 내용의 설정은 캐시된 결과를 돌려준다 (errors는 매번 새 리스트).
+    errors_limit: 모을 오류 최대 개수 (None이면 전부). 그 개수만큼 모이면
+    나머지 검사를 중단한다. ok만 필요하면 0을 넘긴다 (첫 오류에서 중단).
+    0 이하(음수 포함)는 모두 0과 같다: 오류는 모으지 않고 ok만 판정한다.
+    format_errors: False면 메시지 문자열 대신 (코드, 인자...) 튜플을 돌려준다
+    (문자열이 필요해지면 format_error()로 변환).
+    """
+    if errors_limit is not None and errors_limit < 0:
+        errors_limit = 0
+    key = _validate_key(cfg)
+    if key is None:
+        ok, raw = _validate_config_uncached(cfg, errors_limit)
+    else:
+        cached = _VALIDATE_CACHE.get(key)
+        if cached is not None:
+            _VALIDATE_CACHE.move_to_end(key)
+            ok, raw = cached[0], list(cached[1][:errors_limit])
+        else:
+            ok, raw = _validate_config_uncached(cfg, errors_limit)
+            # 중간에 끊은 결과는 캐시하지 않는다
+            if errors_limit is None:
+                _VALIDATE_CACHE[key] = (ok, tuple(raw))
+                if len(_VALIDATE_CACHE) > _VALIDATE_CACHE_SIZE:
+                    _VALIDATE_CACHE.popitem(last=False)
+
+    if format_errors:
+        return ok, [format_error(e) for e in raw]
+    return ok, raw
+
+
+def _validate_config_uncached(cfg: Dict[str, Any], errors_limit: int | None = None) -> Tuple[bool, List[Tuple[Any, ...]]]:
+    # 구조 오류(형식이 틀린 최상위 필드)는 첫 번째에서 바로 반환한다:
+    # 깨진 설정에 대해 주소 겹침 검사 같은 비싼 스캔을 돌리지 않는다.
     stage = cfg.get("stage", {})
     if not isinstance(stage, dict):
-        errors.append("stage 정보가 잘못되었습니다")
+        return False, [("STAGE_TYPE",)][:errors_limit]
 
     fixtures = cfg.get("dmx_fixtures", []) or []
-    if fixtures and not isinstance(fixtures, list):
-        errors.append("dmx_fixtures 형식 오류")
-    else:
-        errors.extend(_validate_fixtures(fixtures))
+    if not isinstance(fixtures, list):
+        return False, [("FIXTURES_TYPE",)][:errors_limit]
 
     pixels = cfg.get("pixel_channels", []) or []
-    if pixels and not isinstance(pixels, list):
-        errors.append("pixel_channels 형식 오류")
+    if not isinstance(pixels, list):
+        return False, [("PIXELS_TYPE",)][:errors_limit]
+
+    # 오류는 필요한 개수만큼만 생성된다 (정상 설정이면 오류 튜플도 만들지 않음)
+    error_iter = _iter_errors(fixtures, pixels)
+    if errors_limit is None:
+        errors = list(error_iter)
     else:
-        errors.extend(_validate_pixels(pixels))
+        errors = list(itertools.islice(error_iter, errors_limit))
+        if not errors:
+            # 모은 오류가 없으면 (errors_limit=0 포함) 남은 오류가 있는지만 확인
+            ok = next(error_iter, None) is None
+            return ok, errors
 
     # audio, profile 등의 기본 필드 존재성은 선택적
     ok = len(errors) == 0
@@ -97,7 +422,5 @@ def validate_config(cfg: Dict[str, Any]) -> Tuple[bool, List[str]]:
 
 
 def get_config_mtime() -> float | None:
-    try:
-        return os.path.getmtime(CONFIG_PATH)
-    except Exception:
-        return None
+    st = _stat(CONFIG_PATH)
+    return None if st is None else st.st_mtime
@@ -0,0 +1,97 @@
+import signal
+
+import numpy as np
+import pytest
+
+from config import settings
+from src.engine.daemon import DaemonLoop, _frame_features_from_buffer
+from src.engine.mode_manager import ModeManager
+from src.engine.outputs.udp_pixel_sender import UDPPixelSender
+
+
+def test_daemon_stops_when_producer_fails(monkeypatch):
+    """오디오 생산 스레드가 예외로 죽으면 소비 루프가 멈춰 있지 않고 오류 코드로 종료한다."""
+    # 테스트 프로세스의 시그널 핸들러는 바꾸지 않는다
+    monkeypatch.setattr(signal, "signal", lambda *args: None)
+
+    loop = DaemonLoop(target_fps=30)
+
+    def broken_frame():
+        raise RuntimeError("오디오 장치 오류")
+
+    monkeypatch.setattr(loop, "_generate_demo_frame", broken_frame)
+
+    assert loop.run() == 1
+    assert not loop.running
+
+
+def test_adjust_intensity_q8_scaling():
+    """데몬/실시간 루프가 공유하는 강도 조정: Q0.8 스케일, 양 끝값은 정확"""
+    data = bytes(range(256))
+    assert UDPPixelSender.adjust_intensity(data, 1.0) == data
+    assert UDPPixelSender.adjust_intensity(data, 0.0) == bytes(256)
+
+    out = np.frombuffer(UDPPixelSender.adjust_intensity(data, 0.3), dtype=np.uint8).astype(int)
+    expected = np.arange(256) * 0.3
+    assert np.all(np.abs(out - expected) <= 1)
+
+
+def test_quiet_mid_heavy_frame_keeps_band_ratios():
+    """무음 임계값 아래의 조용한 1 kHz 톤도 밴드 비율을 계산하므로 SPEECH 점수가 유지된다."""
+    sr = 44100
+    n = 1470
+    t = np.arange(n) / sr
+    amp = 4e-5 * np.sqrt(2)  # RMS 4e-5
+    frame = (amp * np.sin(2 * np.pi * 1000 * t)).astype(np.float32)
+    assert np.sqrt(np.mean(frame.astype(np.float64) ** 2)) < settings.RMS_SILENCE_THRESHOLD * 0.5
+
+    feat, mag = _frame_features_from_buffer(frame, sr)
+    assert mag is not None
+    assert feat["band_mid"] > 0.9
+
+    mm = ModeManager(
+        {
+            "MODE_HOLD_SECONDS": 0.0,
+            "RMS_SILENCE_THRESHOLD": settings.RMS_SILENCE_THRESHOLD,
+            "SPEECH_MID_PROP": settings.SPEECH_MID_PROP,
+            "MUSIC_HIGH_PROP": settings.MUSIC_HIGH_PROP,
+            "MUSIC_ONSET_DENSITY": settings.MUSIC_ONSET_DENSITY,
+        }
+    )
+    idle, speech, _ = mm._mode_scores(feat)
+    assert speech > idle
+
+
+def test_daemon_uses_realtime_window():
+    """데몬과 실시간 경로가 같은 프레임에 같은 창(대칭 np.hanning)을 쓴다."""
+    from src.engine import main
+
+    loop = DaemonLoop(target_fps=30)
+    np.testing.assert_array_equal(loop._win, main._hann(loop.samples_per_frame))
+
+
+def test_bad_highlight_override_is_not_retried_every_frame(monkeypatch):
+    """숫자가 아닌 HIGHLIGHT_* 값: 같은 mtime에 대해 한 번만 읽고, 검출기는 이전 설정을 유지한다."""
+    from src.engine import daemon
+    from src.web import config_manager
+
+    loop = DaemonLoop(target_fps=30)
+    before = loop.detector._threshold
+    loads = []
+
+    def load_config():
+        loads.append(1)
+        return {"HIGHLIGHT_THRESHOLD": "high", "HIGHLIGHT_WEIGHT_RMS": 0.9}
+
+    monkeypatch.setattr(config_manager, "get_config_mtime", lambda: 123.0)
+    monkeypatch.setattr(config_manager, "load_config", load_config)
+    warnings = []
+    monkeypatch.setattr(daemon.logger, "warning", lambda msg, *a, **k: warnings.append(msg))
+
+    for _ in range(5):
+        loop._check_config_reload()
+
+    assert len(loads) == 1
+    assert len(warnings) == 1
+    assert loop.detector._threshold == before
+    assert loop.detector._w_rms == pytest.approx(settings.HIGHLIGHT_WEIGHT_RMS)
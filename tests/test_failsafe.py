@@ -8,8 +8,8 @@ def test_failsafe_normal_state():
     fsm = FailsafeManager()
     
     # 프레임 송출 성공 (정상)
-    fsm.on_frame_sent(now=0.0)
-    assert fsm.get_intensity(now=0.0) == 1.0
+    fsm.on_frame_sent(now_ns=0)
+    assert fsm.get_intensity(now_ns=0) == 1.0
     assert fsm.state == FailsafeState.NORMAL
 
 
@@ -18,15 +18,15 @@ def test_failsafe_last_hold():
     fsm = FailsafeManager(hold_seconds=1.5, ambient_seconds=5.0, black_seconds=15.0)
     
     # 장애 시작
-    fsm.on_frame_fail(now=0.0)
+    fsm.on_frame_fail(now_ns=0)
     
     # 0.5초: 아직 LAST_HOLD
-    intensity = fsm.get_intensity(now=0.5)
+    intensity = fsm.get_intensity(now_ns=500_000_000)
     assert intensity == 1.0
     assert fsm.state == FailsafeState.LAST_HOLD
     
     # 1.5초: 정확히 경계 (전환 직전, 여전히 LAST_HOLD)
-    intensity = fsm.get_intensity(now=1.49)
+    intensity = fsm.get_intensity(now_ns=1_490_000_000)
     assert intensity == 1.0
 
 
@@ -34,10 +34,10 @@ def test_failsafe_dim_ambient():
     """1.5초 후 DIM_AMBIENT로 전환 (ambient_intensity = 0.2)"""
     fsm = FailsafeManager(hold_seconds=1.5, ambient_seconds=5.0, ambient_intensity=0.2)
     
-    fsm.on_frame_fail(now=0.0)
+    fsm.on_frame_fail(now_ns=0)
     
     # 1.6초: DIM_AMBIENT 상태, 강도 = 0.2
-    intensity = fsm.get_intensity(now=1.6)
+    intensity = fsm.get_intensity(now_ns=1_600_000_000)
     assert fsm.state == FailsafeState.DIM_AMBIENT
     assert intensity == pytest.approx(0.2, abs=0.01)
 
@@ -47,10 +47,20 @@ def test_failsafe_recovery():
     fsm = FailsafeManager()
     
     # 장애 발생
-    fsm.on_frame_fail(now=0.0)
+    fsm.on_frame_fail(now_ns=0)
     assert fsm.state == FailsafeState.LAST_HOLD
     
     # 복구
-    fsm.on_frame_sent(now=0.5)
+    fsm.on_frame_sent(now_ns=500_000_000)
     assert fsm.state == FailsafeState.NORMAL
-    assert fsm.get_intensity(now=0.5) == 1.0
+    assert fsm.get_intensity(now_ns=500_000_000) == 1.0
+
+
+def test_failsafe_float_seconds_match_ns():
+    """초 단위 float now는 나노초로 변환되어 now_ns와 같은 경계를 쓴다"""
+    fsm = FailsafeManager(hold_seconds=1.5)
+    fsm.on_frame_fail(now=10.0)
+    assert fsm.get_intensity(now_ns=11_499_999_999) == 1.0
+    assert fsm.state == FailsafeState.LAST_HOLD
+    fsm.get_intensity(now=11.5)
+    assert fsm.state == FailsafeState.DIM_AMBIENT
@@ -0,0 +1,95 @@
+import numpy as np
+import pytest
+
+from config import settings
+from src.engine import daemon, main
+from src.engine.features import extract_features
+from src.engine.mode_manager import ModeManager
+
+
+def make_multitone(sr=44100, seconds=4.0):
+    """150 Hz + 900 Hz 톤에 백색잡음을 섞은 고정 시드 테스트 신호 (잡음 대부분이 2 kHz 이상 대역)"""
+    rng = np.random.default_rng(0)
+    t = np.arange(int(sr * seconds)) / sr
+    x = 0.1 * np.sin(2 * np.pi * 150 * t) + 0.1 * np.sin(2 * np.pi * 900 * t) + 0.02 * rng.standard_normal(t.size)
+    return x.astype(np.float32), sr
+
+
+def mode_settings():
+    return {
+        "MODE_HOLD_SECONDS": settings.MODE_HOLD_SECONDS,
+        "RMS_SILENCE_THRESHOLD": settings.RMS_SILENCE_THRESHOLD,
+        "SPEECH_MID_PROP": settings.SPEECH_MID_PROP,
+        "MUSIC_HIGH_PROP": settings.MUSIC_HIGH_PROP,
+        "MUSIC_ONSET_DENSITY": settings.MUSIC_ONSET_DENSITY,
+    }
+
+
+@pytest.mark.parametrize(
+    "frame_features",
+    [daemon._frame_features_from_buffer, main._frame_features_from_buffer],
+    ids=["daemon", "realtime"],
+)
+def test_frame_features_use_magnitude(frame_features):
+    """프레임 특징의 밴드 비율/flux가 진폭 스펙트럼 기준 값과 같고, 모드가 MUSIC으로 판정된다."""
+    x, sr = make_multitone()
+    n = 1470  # 44100 / 30fps
+    mm = ModeManager(mode_settings())
+    prev_mag = None
+    rows = []
+    for i in range(40):
+        feat, prev_mag = frame_features(x[i * n : (i + 1) * n], sr, prev_mag)
+        rows.append((feat["band_low"], feat["band_mid"], feat["band_high"], feat["flux"]))
+        mm.update(feat, now=1000.0 + i / 30)
+
+    # 진폭 기준 값 (파워로 계산하면 band_high ~0.35, flux ~0.03 수준으로 떨어진다)
+    low, mid, high, flux = np.mean(rows[1:], axis=0)
+    assert low == pytest.approx(0.169, abs=0.01)
+    assert mid == pytest.approx(0.214, abs=0.01)
+    assert high == pytest.approx(0.616, abs=0.01)
+    assert flux == pytest.approx(0.200, abs=0.01)
+    assert mm.current_mode == "MUSIC"
+
+
+def test_extract_features_band_proportions_and_mode():
+    """오프라인 특징: 진폭 스펙트로그램 기준 밴드 비율/onset 밀도와 모드 판정 결과 고정"""
+    x, sr = make_multitone()
+    feats = extract_features(
+        x, sr, {"FRAME_SIZE_MS": settings.FRAME_SIZE_MS, "HOP_SIZE_MS": settings.HOP_SIZE_MS, "N_FFT": settings.N_FFT}
+    )
+
+    assert feats["band_low"].mean() == pytest.approx(0.152, abs=0.01)
+    assert feats["band_mid"].mean() == pytest.approx(0.200, abs=0.01)
+    assert feats["band_high"].mean() == pytest.approx(0.648, abs=0.01)
+    assert feats["flux"].mean() == pytest.approx(0.206, abs=0.01)
+    assert feats["onset_density"] == pytest.approx(0.987, abs=0.01)
+
+    mm = ModeManager(mode_settings())
+    modes = []
+    for i, t in enumerate(feats["times"]):
+        feat = {k: float(feats[k][i]) for k in ("rms", "band_low", "band_mid", "band_high", "flux")}
+        feat["onset_density"] = feats["onset_density"]
+        # run_analysis처럼 프레임 타임스탬프(0.0부터)를 그대로 사용
+        modes.append(mm.update(feat, now=float(t)))
+    # hold(0.6초) 이후로는 계속 MUSIC
+    assert modes[-1] == "MUSIC"
+    assert modes.count("MUSIC") >= len(modes) - 13
+
+
+def test_spectrogram_keeps_padded_tail_frame():
+    """frame_len < n_fft: scipy.signal.stft(padded=True)처럼 끝의 제로패딩 프레임까지 포함한다."""
+    from scipy import signal
+
+    from src.engine.features import compute_spectrogram
+
+    x, sr = make_multitone(seconds=1.0)
+    n_fft, hop = 2048, 441
+    _, _, Z = signal.stft(x, fs=sr, nperseg=n_fft, noverlap=n_fft - hop, boundary=None)
+    ref = np.abs(Z)
+    _, S = compute_spectrogram(x, sr, n_fft, hop)
+    assert S.shape == ref.shape
+    np.testing.assert_allclose(S / S.sum(axis=0), ref / ref.sum(axis=0), atol=1e-6)
+
+    # 20 ms 프레임(RMS 98개) / 10 ms hop / 2048 FFT -> STFT 기준 97 프레임
+    feats = extract_features(x, sr, {"FRAME_SIZE_MS": 20, "HOP_SIZE_MS": 10, "N_FFT": n_fft})
+    assert len(feats["rms"]) == ref.shape[1] == 97
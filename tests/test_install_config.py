@@ -1,33 +1,198 @@
+import json
+
+import pytest
+
+from src.web import config_manager
 from src.web.config_manager import validate_config
 
 
-def test_dmx_address_duplicate():
-    cfg = {
-        "dmx_fixtures": [
-            {"id": "f1", "start_address": 1, "channel_mode": "3"},
-            {"id": "f2", "start_address": 2, "channel_mode": "1"},
-        ]
-    }
+def _fixtures(*pairs):
+    """(start_address, channel_mode) 쌍으로 dmx_fixtures 목록을 만든다."""
+    return [{"id": f"f{i}", "start_address": s, "channel_mode": m} for i, (s, m) in enumerate(pairs, 1)]
+
+
+@pytest.mark.parametrize(
+    "cfg,needle",
+    [
+        ({"dmx_fixtures": _fixtures((1, "3"), (2, "1"))}, "중복"),
+        # 두 개의 300채널 장치 -> 600 total -> overflow
+        ({"dmx_fixtures": _fixtures((1, "300"), (301, "300"))}, "총 DMX 채널 수 초과"),
+        ({"pixel_channels": [{"output_id": 1, "pixel_count": 2000}]}, "pixel_count"),
+    ],
+    ids=["dmx_address_duplicate", "dmx_total_channels_overflow", "pixel_count_range"],
+)
+def test_invalid_config_reports_error(cfg, needle):
     ok, errors = validate_config(cfg)
     assert not ok
-    assert any("중복" in e or "중복" in e for e in errors)
+    assert any(needle in e for e in errors)
 
 
-def test_dmx_total_channels_overflow():
-    # 두 개의 300채널 장치 -> 600 total -> overflow
+def test_validate_config_cached_result_is_fresh_copy():
+    cfg = {"pixel_channels": [{"output_id": 1, "pixel_count": 2000}]}
+    ok1, errors1 = validate_config(cfg)
+    errors1.append("호출자 수정")
+    ok2, errors2 = validate_config(cfg)
+    assert (ok1, ok2) == (False, False)
+    assert errors2 == ["pixel_count 범위오류: output_id=1 count=2000"]
+
+    # 같다고 비교되는 값(1 / 1.0)이라도 메시지 형식이 다르면 별도 결과
+    _, errors3 = validate_config({"pixel_channels": [{"output_id": 1.0, "pixel_count": 2000}]})
+    assert errors3 == ["pixel_count 범위오류: output_id=1.0 count=2000"]
+
+
+def test_structural_error_returns_early():
+    # stage 형식 오류면 fixtures 겹침 검사 없이 바로 반환
+    cfg = {"stage": "bad", "dmx_fixtures": _fixtures((1, "3"), (2, "1"))}
+    assert validate_config(cfg) == (False, ["stage 정보가 잘못되었습니다"])
+    assert validate_config({"dmx_fixtures": "bad"}) == (False, ["dmx_fixtures 형식 오류"])
+
+
+def test_errors_limit_stops_early():
     cfg = {
-        "dmx_fixtures": [
-            {"id": "a", "start_address": 1, "channel_mode": "300"},
-            {"id": "b", "start_address": 301, "channel_mode": "300"},
-        ]
+        "dmx_fixtures": _fixtures((1, "3"), (2, "3")),
+        "pixel_channels": [{"output_id": 1, "pixel_count": 2000}],
     }
+    assert validate_config(cfg, errors_limit=0) == (False, [])
+    assert validate_config(cfg, errors_limit=1) == (False, ["DMX 주소 중복: 2"])
     ok, errors = validate_config(cfg)
-    assert not ok
-    assert any("총 DMX 채널 수 초과" in e for e in errors)
+    assert not ok and len(errors) == 3
+    assert validate_config({"pixel_channels": []}, errors_limit=0) == (True, [])
 
+    # 음수는 0과 같이 취급 (오류 없이 ok만 판정)
+    assert validate_config(cfg, errors_limit=-1) == (False, [])
+    assert validate_config({"stage": "bad"}, errors_limit=-3) == (False, [])
+    assert validate_config({"pixel_channels": []}, errors_limit=-1) == (True, [])
 
-def test_pixel_count_range():
-    cfg = {"pixel_channels": [{"output_id": 1, "pixel_count": 2000}]}
-    ok, errors = validate_config(cfg)
+
+def test_raw_errors_format_on_demand():
+    cfg = {"pixel_channels": [{"output_id": 2, "pixel_count": -1}]}
+    ok, raw = validate_config(cfg, format_errors=False)
     assert not ok
-    assert any("pixel_count" in e for e in errors)
+    assert raw == [("PIXEL_COUNT_RANGE", 2, -1)]
+    assert [config_manager.format_error(e) for e in raw] == validate_config(cfg)[1]
+
+
+def test_load_config_cache_follows_save(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_manager, "CONFIG_PATH", str(tmp_path / "install_config.json"))
+
+    # 파일이 없으면 빈 dict
+    assert config_manager.load_config() == {}
+
+    config_manager.save_config({"stage": {"name": "a"}}, immediate=True)
+    cfg = config_manager.load_config()
+    assert cfg == {"stage": {"name": "a"}}
+
+    # 반환값을 수정해도 캐시된 스냅샷은 바뀌지 않음
+    cfg["stage"]["name"] = "changed"
+    assert config_manager.load_config() == {"stage": {"name": "a"}}
+
+    # 저장 직후 로드는 새 내용을 읽음
+    config_manager.save_config({"stage": {"name": "b"}}, immediate=True)
+    assert config_manager.load_config() == {"stage": {"name": "b"}}
+
+
+def test_load_config_hit_returns_independent_copy(tmp_path, monkeypatch):
+    path = tmp_path / "install_config.json"
+    path.write_text(json.dumps({"stage": {"name": "a"}, "pixel_channels": [{"output_id": 1}]}), encoding="utf-8")
+    monkeypatch.setattr(config_manager, "CONFIG_PATH", str(path))
+
+    first = config_manager.load_config()
+    first["stage"]["name"] = "수정됨"
+    first["pixel_channels"].append({"output_id": 2})
+
+    # 캐시 히트여도 호출자의 수정이 다음 로드에 새지 않는다
+    second = config_manager.load_config()
+    assert second == {"stage": {"name": "a"}, "pixel_channels": [{"output_id": 1}]}
+    assert second is not first
+    assert config_manager.load_config_bytes() == path.read_bytes()
+
+
+def test_save_config_debounces_writes(tmp_path, monkeypatch):
+    path = tmp_path / "install_config.json"
+    monkeypatch.setattr(config_manager, "CONFIG_PATH", str(path))
+    monkeypatch.setattr(config_manager, "SAVE_DEBOUNCE_SECONDS", 60.0)
+
+    # 연속 저장은 메모리에만 보관되고, 로드는 마지막 저장분을 돌려줌
+    config_manager.save_config({"stage": {"name": "a"}})
+    config_manager.save_config({"stage": {"name": "b"}})
+    assert not path.exists()
+    assert config_manager.load_config() == {"stage": {"name": "b"}}
+
+    # flush 시 마지막 내용만 한 번 기록
+    config_manager._flush()
+    assert path.exists()
+    assert config_manager.load_config() == {"stage": {"name": "b"}}
+
+
+def test_save_config_skips_unchanged_content(tmp_path, monkeypatch):
+    monkeypatch.setattr(config_manager, "CONFIG_PATH", str(tmp_path / "install_config.json"))
+    writes = []
+    real_write = config_manager._write_atomic
+    monkeypatch.setattr(config_manager, "_write_atomic", lambda p, b: (writes.append(p), real_write(p, b)))
+
+    config_manager.save_config({"stage": {"name": "a"}}, immediate=True)
+    config_manager.save_config({"stage": {"name": "a"}}, immediate=True)
+    assert len(writes) == 1
+
+    # 내용이 바뀌면 다시 기록
+    config_manager.save_config({"stage": {"name": "b"}}, immediate=True)
+    assert len(writes) == 2
+    assert config_manager.load_config() == {"stage": {"name": "b"}}
+
+
+def test_saved_file_is_compact_and_export_is_pretty(tmp_path, monkeypatch):
+    path = tmp_path / "install_config.json"
+    monkeypatch.setattr(config_manager, "CONFIG_PATH", str(path))
+    cfg = {"stage": {"name": "메인"}, "pixel_channels": [{"output_id": 1, "pixel_count": 10}]}
+
+    config_manager.save_config(cfg, immediate=True)
+    text = path.read_text(encoding="utf-8")
+    assert "\n" not in text and ", " not in text
+
+    pretty = config_manager.export_pretty(config_manager.load_config())
+    assert pretty.startswith("{\n  ")
+    assert json.loads(pretty) == cfg
+
+
+def test_failed_write_keeps_pending_config(tmp_path, monkeypatch):
+    path = tmp_path / "install_config.json"
+    monkeypatch.setattr(config_manager, "CONFIG_PATH", str(path))
+    monkeypatch.setattr(config_manager, "SAVE_DEBOUNCE_SECONDS", 60.0)
+    real_write = config_manager._write_atomic
+
+    def failing_write(p, payload):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(config_manager, "_write_atomic", failing_write)
+    config_manager.save_config({"stage": {"name": "a"}})
+    # 타이머/atexit 경로는 로그만 남기고 예외를 던지지 않는다
+    config_manager._flush()
+
+    # 기록에 실패해도 저장분은 남아 있고 로드는 그 내용을 돌려준다
+    assert not path.exists()
+    assert config_manager.load_config() == {"stage": {"name": "a"}}
+
+    # 쓰기가 복구되면 다음 flush(재시도)에서 기록된다
+    monkeypatch.setattr(config_manager, "_write_atomic", real_write)
+    config_manager._flush()
+    assert json.loads(path.read_text(encoding="utf-8")) == {"stage": {"name": "a"}}
+
+
+def test_immediate_save_raises_write_error(tmp_path, monkeypatch):
+    path = tmp_path / "install_config.json"
+    monkeypatch.setattr(config_manager, "CONFIG_PATH", str(path))
+    monkeypatch.setattr(config_manager, "SAVE_DEBOUNCE_SECONDS", 60.0)
+    real_write = config_manager._write_atomic
+
+    def failing_write(p, payload):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(config_manager, "_write_atomic", failing_write)
+    # 즉시 저장은 호출자(웹 API)에게 쓰기 오류를 알린다
+    with pytest.raises(OSError):
+        config_manager.save_config({"stage": {"name": "a"}}, immediate=True)
+
+    # 보관된 저장분과 재시도 타이머 정리
+    monkeypatch.setattr(config_manager, "_write_atomic", real_write)
+    config_manager._flush()
+    assert path.exists()
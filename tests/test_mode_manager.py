@@ -1,5 +1,7 @@
 import time
 
+import pytest
+
 from src.engine.mode_manager import ModeManager
 
 
@@ -7,8 +9,13 @@ def make_feat(rms=0.01, low=0.2, mid=0.5, high=0.3, onset=0.01):
     return {"rms": rms, "band_low": low, "band_mid": mid, "band_high": high, "onset_density": onset}
 
 
-def test_idle_to_music_transition():
-    settings = {
+MUSIC_FEAT = make_feat(rms=0.02, low=0.1, mid=0.2, high=0.7, onset=0.2)
+
+
+@pytest.fixture(scope="module")
+def mm_settings():
+    """공통 설정 (MODE_HOLD_SECONDS만 테스트별로 바꿔 쓴다)"""
+    return {
         "RMS_SILENCE_THRESHOLD": 1e-4,
         "SPEECH_MID_PROP": 0.45,
         "MUSIC_HIGH_PROP": 0.25,
@@ -16,42 +23,67 @@ def test_idle_to_music_transition():
         "MODE_HOLD_SECONDS": 0.2,
     }
 
-    mm = ModeManager(settings)
+
+@pytest.mark.parametrize(
+    "hold,expected",
+    [
+        # 몇 프레임 MUSIC 조건을 지속적으로 공급 (hold 초과) -> 전환
+        (0.2, "MUSIC"),
+        # hold 10초: 아직 전환되지 않음
+        (10.0, "IDLE"),
+    ],
+)
+def test_idle_to_music_transition(mm_settings, hold, expected):
+    mm = ModeManager({**mm_settings, "MODE_HOLD_SECONDS": hold})
 
     # 초기: IDLE 상태
     assert mm.current_mode == "IDLE"
 
     now = 1000.0
-
-    # 몇 프레임 MUSIC 조건을 지속적으로 공급 (hold 초과)
-    music_feat = make_feat(rms=0.02, low=0.1, mid=0.2, high=0.7, onset=0.2)
     for i in range(5):
         now += 0.06
-        mm.update(music_feat, now=now)
-
-    assert mm.current_mode == "MUSIC"
+        mm.update(MUSIC_FEAT, now=now)
 
+    assert mm.current_mode == expected
 
-def test_no_transition_if_not_held():
-    settings = {
-        "RMS_SILENCE_THRESHOLD": 1e-4,
-        "SPEECH_MID_PROP": 0.45,
-        "MUSIC_HIGH_PROP": 0.25,
-        "MUSIC_ONSET_DENSITY": 0.05,
-        "MODE_HOLD_SECONDS": 0.5,
-    }
 
-    mm = ModeManager(settings)
+def test_no_transition_if_not_held(mm_settings):
+    mm = ModeManager({**mm_settings, "MODE_HOLD_SECONDS": 0.5})
     now = 2000.0
 
-    music_feat = make_feat(rms=0.02, low=0.1, mid=0.2, high=0.7, onset=0.2)
     # 간헐적으로 제공: 충분히 유지되지 않음
     now += 0.1
-    mm.update(music_feat, now=now)
+    mm.update(MUSIC_FEAT, now=now)
     now += 0.1
     mm.update(make_feat(rms=0.00001, low=0.8, mid=0.1, high=0.1, onset=0.0), now=now)
     now += 0.1
-    mm.update(music_feat, now=now)
+    mm.update(MUSIC_FEAT, now=now)
 
     # hold 시간이 충분히 흐르지 않았으므로 전환되지 않아야 함
     assert mm.current_mode != "MUSIC"
+
+
+def test_reload_updates_hold(mm_settings):
+    """reload()로 교체한 hold 시간이 다음 update부터 반영된다."""
+    mm = ModeManager({**mm_settings, "MODE_HOLD_SECONDS": 10.0})
+    now = 3000.0
+
+    for i in range(5):
+        now += 0.06
+        mm.update(MUSIC_FEAT, now=now)
+    # hold 10초: 아직 전환되지 않음
+    assert mm.current_mode == "IDLE"
+
+    # hold를 줄이면 후보 유지 시간이 이미 충분하므로 다음 프레임에 전환
+    mm.reload({**mm_settings, "MODE_HOLD_SECONDS": 0.2})
+    now += 0.06
+    mm.update(MUSIC_FEAT, now=now)
+    assert mm.current_mode == "MUSIC"
+
+
+def test_transition_when_timeline_starts_at_zero(mm_settings):
+    """오디오 타임라인(now=0.0부터 시작)에서도 hold 후 전환된다."""
+    mm = ModeManager(mm_settings)
+    for i in range(10):
+        mm.update(MUSIC_FEAT, now=i * 0.05)
+    assert mm.current_mode == "MUSIC"
@@ -1,13 +1,22 @@
 import numpy as np
+import pytest
 
 from src.engine.main import run_realtime
 
 
-def test_realtime_runs_one_second():
-    # 1초짜리 더미 신호 (사인파)
+@pytest.fixture(scope="session")
+def sine_1s(tmp_path_factory):
+    """1초짜리 더미 신호 (440Hz 사인파): 세션에서 한 번 생성해 .npy로 저장하고 mmap으로 읽는다"""
     sr = 44100
-    t = np.linspace(0, 1.0, int(sr * 1.0), endpoint=False)
-    x = 0.01 * np.sin(2 * np.pi * 440.0 * t).astype(np.float32)
+    path = tmp_path_factory.mktemp("audio") / "sine.npy"
+    if not path.exists():
+        t = np.arange(sr) / sr
+        np.save(path, (0.01 * np.sin(2 * np.pi * 440.0 * t)).astype(np.float32))
+    return np.load(path, mmap_mode="r"), sr
+
+
+def test_realtime_runs_one_second(sine_1s):
+    x, sr = sine_1s
 
     # 루프를 1초까지만 실행하도록 max_seconds 지정
     frames = run_realtime(x=x, sr=sr, target_fps=30, max_seconds=1.0)